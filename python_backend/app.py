@@ -1,46 +1,32 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, request, jsonify, send_file, Response, stream_with_context
 from flask_cors import CORS
 import os
-import pandas as pd
 import json
 import uuid
 import logging
-import threading
-import time
+import multiprocessing
 from datetime import datetime
 from werkzeug.utils import secure_filename
 import traceback
-import sys
-import re
 import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-import PyPDF2
-import docx
-import spacy
 
 # Import custom modules
 import config
-from models import init_db, Document, DocumentChunk, Job, JobResult, GeneratedDocument, Session
-from vector_db.document_processor import DocumentProcessor
-from vector_db.vector_store import VectorStore
-from llm_agent.agent import LLMAgent
-from llm_agent.ollama_client import OllamaClient
-from document_generator.generator import DocumentGenerator
-
-# Download NLTK resources
-nltk.download('punkt', quiet=True)
-nltk.download('stopwords', quiet=True)
-nltk.download('wordnet', quiet=True)
-
-# Load spaCy model
-try:
-    nlp = spacy.load("en_core_web_sm")
-except:
-    # If model not found, download it
-    os.system("python -m spacy download en_core_web_sm")
-    nlp = spacy.load("en_core_web_sm")
+from models import init_db, pool_stats, Document, Job, JobResult, GeneratedDocument, DocumentBlob, Session
+from llm_agent.generation_pool import GenerationPool
+from llm_agent.response_cache import get_response_cache
+from document_generator.generator import DocumentGenerator, FORMATS, FILE_EXTENSIONS, get_render_pool
+from services import get_llm_agent, get_document_processor, get_ollama_client, peek as peek_service
+from task_queue.queue import task_queue
+from task_queue.worker import WorkerPool
+from skill_analysis.pipeline import skill_pipeline
+from skill_analysis.normalizer import get_normalizer
+from skill_analysis.scoring import score_cohort
+from text_extraction import extract_pdf_text, extract_docx_text
+from csv_stream import iter_csv_batches, count_csv_rows
+from batch_writer import BatchWriter
+from events import get_event_bus
+from zip_stream import ZipPlan
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -50,118 +36,40 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app)
 
-# Initialize database
-init_db()
-
-# Create upload folder
-if not os.path.exists(config.UPLOAD_FOLDER):
-    os.makedirs(config.UPLOAD_FOLDER)
 app.config['UPLOAD_FOLDER'] = config.UPLOAD_FOLDER
 
-# Create output folder
-if not os.path.exists(config.OUTPUT_FOLDER):
-    os.makedirs(config.OUTPUT_FOLDER)
-
-# Skills dictionary for matching
-SKILLS = {
-    'technical': [
-        'python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'php', 'swift', 'kotlin',
-        'react', 'angular', 'vue', 'node.js', 'express', 'django', 'flask', 'spring',
-        'sql', 'nosql', 'mongodb', 'mysql', 'postgresql', 'oracle', 'firebase',
-        'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'git', 'github',
-        'machine learning', 'deep learning', 'ai', 'data science', 'big data',
-        'hadoop', 'spark', 'tableau', 'power bi', 'excel', 'vba',
-        'html', 'css', 'sass', 'less', 'bootstrap', 'tailwind',
-        'rest api', 'graphql', 'microservices', 'serverless',
-        'linux', 'unix', 'windows', 'macos', 'android', 'ios',
-        'agile', 'scrum', 'kanban', 'jira', 'confluence'
-    ],
-    'soft': [
-        'communication', 'teamwork', 'leadership', 'problem solving', 'critical thinking',
-        'time management', 'organization', 'adaptability', 'flexibility', 'creativity',
-        'work ethic', 'interpersonal skills', 'emotional intelligence', 'conflict resolution',
-        'decision making', 'stress management', 'attention to detail', 'customer service',
-        'presentation', 'negotiation', 'persuasion', 'mentoring', 'coaching'
-    ],
-    'business': [
-        'marketing', 'sales', 'finance', 'accounting', 'hr', 'human resources',
-        'project management', 'product management', 'operations', 'strategy',
-        'business development', 'customer relationship management', 'crm',
-        'supply chain', 'logistics', 'procurement', 'quality assurance', 'qa',
-        'business analysis', 'data analysis', 'market research', 'competitive analysis',
-        'budgeting', 'forecasting', 'risk management', 'compliance', 'legal'
-    ]
-}
-
 def allowed_file(filename, file_type):
     """Check if file has an allowed extension"""
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in config.ALLOWED_EXTENSIONS.get(file_type, [])
 
-def extract_text_from_pdf(pdf_file):
-    """Extract text from PDF file"""
+def extract_text_from_pdf(pdf_path):
+    """Extract text from PDF file (pages are sharded across the CPU pool)"""
     text = ""
     try:
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
+        text = extract_pdf_text(pdf_path)
     except Exception as e:
         logger.error(f"Error extracting text from PDF: {e}")
     return text
 
-def extract_text_from_docx(docx_file):
-    """Extract text from DOCX file"""
+def extract_text_from_docx(docx_path):
+    """Extract text from DOCX file in the CPU pool"""
     text = ""
     try:
-        doc = docx.Document(docx_file)
-        for para in doc.paragraphs:
-            text += para.text + "\n"
+        text = extract_docx_text(docx_path)
     except Exception as e:
         logger.error(f"Error extracting text from DOCX: {e}")
     return text
 
 def preprocess_text(text):
     """Preprocess text for analysis"""
-    # Convert to lowercase
-    text = text.lower()
-    
-    # Remove special characters and numbers
-    text = re.sub(r'[^a-zA-Z\s]', '', text)
-    
-    # Tokenize
-    tokens = word_tokenize(text)
-    
-    # Remove stopwords
-    stop_words = set(stopwords.words('english'))
-    tokens = [word for word in tokens if word not in stop_words]
-    
-    # Lemmatize
-    lemmatizer = WordNetLemmatizer()
-    tokens = [lemmatizer.lemmatize(word) for word in tokens]
-    
-    return ' '.join(tokens)
+    # Lowercase, strip non-letters, drop stopwords and lemmatize (cached)
+    return get_normalizer().normalize(text)
 
-def extract_skills(text):
+def extract_skills(text, raw_text=None):
     """Extract skills from text"""
-    skills = {
-        'technical': [],
-        'soft': [],
-        'business': []
-    }
-    
-    # Process with spaCy for better entity recognition
-    doc = nlp(text.lower())
-    
-    # Extract skills from each category
-    for category, skill_list in SKILLS.items():
-        for skill in skill_list:
-            if skill in text.lower():
-                # Check if it's a complete word or part of a larger word
-                pattern = r'\b' + re.escape(skill) + r'\b'
-                if re.search(pattern, text.lower()):
-                    skills[category].append(skill)
-    
-    return skills
+    # Vocabulary matching, plus spaCy entities when configured
+    return skill_pipeline.extract(text, raw_text=raw_text)
 
 def calculate_match_score(student_skills, job_skills):
     """Calculate match score between student skills and job skills"""
@@ -198,7 +106,7 @@ def analyze_student_profile(student_data):
     processed_text = preprocess_text(profile_text)
     
     # Extract skills
-    skills = extract_skills(processed_text)
+    skills = extract_skills(processed_text, raw_text=profile_text)
     
     return skills
 
@@ -208,12 +116,74 @@ def analyze_job_description(job_desc_text):
     processed_text = preprocess_text(job_desc_text)
     
     # Extract skills
-    skills = extract_skills(processed_text)
+    skills = extract_skills(processed_text, raw_text=job_desc_text)
     
     return skills
 
+def job_document_id(job, document_type):
+    """ID of a job's document of a type ('student_data' or 'job_description'), or None"""
+    return next((document.id for document in job.documents if document.document_type == document_type), None)
+
+def job_document_ids(job):
+    """Source document IDs of a job, as keyword arguments for the LLM agent"""
+    return {
+        "student_document_id": job_document_id(job, 'student_data'),
+        "job_description_document_id": job_document_id(job, 'job_description')
+    }
+
+def generate_student_documents(student_email, company, role, job_db_id, writer=None, document_ids=None):
+    """Generate a student's personalized document in all formats
+    
+    GeneratedDocument rows are buffered in writer when one is given.
+    document_ids holds the job's source document IDs (see job_document_ids).
+    """
+    # Generate personalized document
+    document_content = get_llm_agent().generate_personalized_document(
+        student_email=student_email,
+        company=company,
+        role=role,
+        **(document_ids or {})
+    )
+    
+    # Render all formats from one parse, saving their rows together. In lazy
+    # mode only markdown is stored; other formats render on first download.
+    doc_generator = DocumentGenerator(writer=writer)
+    return doc_generator.generate_documents(
+        content=document_content,
+        student_email=student_email,
+        company=company,
+        role=role,
+        job_id=job_db_id,
+        formats=('markdown',) if config.DOCUMENT_RENDER_MODE == 'lazy' else FORMATS
+    )
+
+def job_progress(job):
+    """Status and progress fields of a job"""
+    return {
+        "job_id": job.job_id,
+        "status": job.status,
+        "created_at": job.created_at.isoformat(),
+        "completed_at": job.completed_at.isoformat() if job.completed_at else None,
+        "total_students": job.total_students,
+        "processed_students": job.processed_students
+    }
+
+# Statuses after which a job sends no more events
+JOB_FINAL_STATUSES = ('completed', 'failed')
+
+def publish_job_event(job_id, event, data):
+    """Push an event to clients watching a job
+    
+    Per-student events are batched by the event bus; status changes are
+    sent at once.
+    """
+    get_event_bus().publish(job_id, event, data, buffered=(event == 'student'))
+
 def process_files(job_id, csv_path, job_desc_path):
-    """Process uploaded files and generate personalized documents"""
+    """Process uploaded files and generate personalized documents
+    
+    Raises on failure so the task queue can retry the stage.
+    """
     session = Session()
     try:
         # Get job from database
@@ -222,30 +192,29 @@ def process_files(job_id, csv_path, job_desc_path):
             logger.error(f"Job {job_id} not found")
             return
         
+        # Drop results from an earlier attempt so a retried stage starts clean
+        session.query(JobResult).filter(JobResult.job_id == job.id).delete(synchronize_session=False)
+        session.query(GeneratedDocument).filter(GeneratedDocument.job_id == job.id).delete(synchronize_session=False)
+        
         # Update job status
         job.status = 'processing'
+        job.processed_students = 0
         session.commit()
         
-        # Initialize document processor
-        doc_processor = DocumentProcessor()
-        
         # Process CSV file
         try:
-            # Read CSV file
-            df = pd.read_csv(csv_path)
-            student_data = df.to_dict('records')
-            job.total_students = len(student_data)
+            # Count students without loading the CSV
+            job.total_students = count_csv_rows(csv_path)
             session.commit()
+            publish_job_event(job_id, 'status', job_progress(job))
             
             # Read job description file
             job_desc_text = ""
             job_desc_filename = os.path.basename(job_desc_path)
             if job_desc_filename.endswith('.pdf'):
-                with open(job_desc_path, 'rb') as f:
-                    job_desc_text = extract_text_from_pdf(f)
+                job_desc_text = extract_text_from_pdf(job_desc_path)
             elif job_desc_filename.endswith('.docx'):
-                with open(job_desc_path, 'rb') as f:
-                    job_desc_text = extract_text_from_docx(f)
+                job_desc_text = extract_text_from_docx(job_desc_path)
             else:
                 with open(job_desc_path, 'r') as f:
                     job_desc_text = f.read()
@@ -253,122 +222,144 @@ def process_files(job_id, csv_path, job_desc_path):
             # Analyze job description
             job_skills = analyze_job_description(job_desc_text)
             
-            # Process each student
-            for i, student in enumerate(student_data):
-                # Update progress
-                job.processed_students = i + 1
-                session.commit()
-                
-                # Get student name and email
-                student_name = student.get('full name of the student', student.get('Name', student.get('name', f'Student {i+1}')))
-                student_email = student.get('email', student.get('Email', ''))
-                student_id = student.get('Roll_Number', student.get('RollNumber', student.get('ID', student.get('StudentID', f'S{1000+i}'))))
-                
-                # Analyze student profile
-                student_skills = analyze_student_profile(student)
-                
-                # Calculate match score
-                match_score = calculate_match_score(student_skills, job_skills)
-                
-                # Determine status based on match score
-                if match_score >= 70:
-                    status = 'Success'
-                elif match_score >= 40:
-                    status = 'Partial Success'
-                else:
-                    status = 'Failure'
-                
-                # Initialize LLM agent
-                llm_agent = LLMAgent()
-                
-                # Extract company and role from job description filename
-                parts = os.path.splitext(job_desc_filename)[0].split('_')
-                company = parts[0] if len(parts) > 0 else "Unknown"
-                role = parts[1] if len(parts) > 1 else "Unknown"
-                
-                # Generate personalized document
-                document_content = llm_agent.generate_personalized_document(
-                    student_email=student_email,
-                    company=company,
-                    role=role
-                )
-                
-                # Initialize document generator
-                doc_generator = DocumentGenerator()
-                
-                # Generate documents in all formats
-                markdown_result = doc_generator.generate_document(
-                    content=document_content,
-                    student_email=student_email,
-                    company=company,
-                    role=role,
-                    job_id=job.id,
-                    format_type='markdown'
-                )
-                
-                pdf_result = doc_generator.generate_document(
-                    content=document_content,
-                    student_email=student_email,
-                    company=company,
-                    role=role,
-                    job_id=job.id,
-                    format_type='pdf'
-                )
-                
-                docx_result = doc_generator.generate_document(
-                    content=document_content,
-                    student_email=student_email,
-                    company=company,
-                    role=role,
-                    job_id=job.id,
-                    format_type='docx'
+            def students():
+                # Stream the CSV, scoring each row batch against the job description at once
+                for batch in iter_csv_batches(csv_path):
+                    scores = score_cohort(batch, job_skills, start=int(batch.index[0]))
+                    yield from scores.itertuples(index=False)
+            
+            # Extract company and role from job description filename
+            parts = os.path.splitext(job_desc_filename)[0].split('_')
+            company = parts[0] if len(parts) > 0 else "Unknown"
+            role = parts[1] if len(parts) > 1 else "Unknown"
+            
+            # Results, generated documents and progress are written in bulk
+            writer = BatchWriter()
+            document_ids = job_document_ids(job)
+            
+            def generate(student):
+                return generate_student_documents(
+                    student.email, company, role, job.id,
+                    writer=writer, document_ids=document_ids
                 )
+            
+            # Generate documents concurrently, recording results as they complete
+            pool = GenerationPool()
+            for i, (student, _, error) in enumerate(pool.imap_unordered(generate, students())):
+                writer.add(JobResult, {
+                    'job_id': job.id,
+                    'student_name': student.name,
+                    'student_email': student.email,
+                    'student_id': student.student_id,
+                    'status': 'Error' if error else student.status,
+                    'match_score': float(student.match_score),
+                    'skills': student.skills,
+                    'error': str(error) if error else None
+                })
                 
-                # Create job result
-                result = JobResult(
-                    job_id=job.id,
-                    student_name=student_name,
-                    student_email=student_email,
-                    student_id=student_id,
-                    status=status,
-                    match_score=match_score,
-                    skills=student_skills
-                )
-                session.add(result)
-                session.commit()
+                # Update progress (throttled to one write per flush)
+                writer.set_progress(job.id, i + 1)
+                writer.maybe_flush()
                 
-                # Simulate processing time
-                time.sleep(0.5)
+                publish_job_event(job_id, 'student', {
+                    "name": student.name,
+                    "email": student.email,
+                    "status": 'Error' if error else student.status,
+                    "matchScore": float(student.match_score),
+                    "processed_students": i + 1,
+                    "total_students": job.total_students
+                })
+            
+            writer.close()
         except Exception as e:
             logger.error(f"Error processing files: {e}")
-            traceback.print_exc()
-            job.status = 'failed'
-            session.commit()
-            return
+            session.rollback()
+            raise
         
         # Update job status
         job.status = 'completed'
         job.completed_at = datetime.utcnow()
         session.commit()
-        
-    except Exception as e:
-        logger.error(f"Error in process_files: {e}")
-        traceback.print_exc()
-        try:
-            job.status = 'failed'
+        publish_job_event(job_id, 'status', job_progress(job))
+    finally:
+        session.close()
+
+def set_job_status(job_db_id, status):
+    """Set the status of a job by database ID"""
+    session = Session()
+    try:
+        job = session.query(Job).filter(Job.id == job_db_id).first()
+        if job:
+            job.status = status
             session.commit()
-        except:
-            pass
+            publish_job_event(job.job_id, 'status', job_progress(job))
     finally:
         session.close()
 
+def run_ingest_stage(job_db_id, payload):
+    """Task queue stage: split and embed the uploaded documents"""
+    set_job_status(job_db_id, 'ingesting')
+    
+    doc_processor = get_document_processor()
+    llm_agent = peek_service('llm_agent')
+    for document_id in (payload['csv_document_id'], payload['job_desc_document_id']):
+        if not doc_processor.process_document(document_id):
+            raise RuntimeError(f"Failed to process document {document_id}")
+        if llm_agent:
+            llm_agent.forget_document(document_id)
+    
+    return 'generate', payload
+
+def run_generate_stage(job_db_id, payload):
+    """Task queue stage: score students and generate their documents"""
+    process_files(payload['job_id'], payload['csv_path'], payload['job_desc_path'])
+
+def mark_job_failed(job_db_id, error):
+    """Mark a job failed once its task has used up its attempts"""
+    logger.error(f"Job {job_db_id} failed: {error}")
+    set_job_status(job_db_id, 'failed')
+
+TASK_HANDLERS = {
+    'ingest': run_ingest_stage,
+    'generate': run_generate_stage
+}
+
+worker_pool = WorkerPool(TASK_HANDLERS, on_failed=mark_job_failed)
+
+def initialize():
+    """Prepare NLTK data, the database and folders, and start the task workers
+    
+    Queued tasks run in this process unless TASK_WORKERS=0 (run worker.py
+    to process the queue elsewhere). Tasks left over from a restart are
+    picked up again once their lease expires.
+    """
+    # Download NLTK resources
+    nltk.download('punkt', quiet=True)
+    nltk.download('stopwords', quiet=True)
+    nltk.download('wordnet', quiet=True)
+    
+    # Initialize database
+    init_db()
+    
+    # Create upload and output folders
+    for folder in (config.UPLOAD_FOLDER, config.OUTPUT_FOLDER):
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+    
+    if config.TASK_WORKERS > 0:
+        worker_pool.start()
+
+# CPU pool processes re-import this module under spawn; they only need its
+# functions, not the downloads, migrations and workers
+if multiprocessing.parent_process() is None:
+    initialize()
+
 @app.route('/api/status', methods=['GET'])
 def status():
     """API status endpoint"""
     try:
         # Check if Ollama is available
-        ollama_client = OllamaClient()
-        models = ollama_client.list_models()
+        models = get_ollama_client().list_models()
         
         return jsonify({
             "status": "Server is running",
@@ -385,6 +376,21 @@ def status():
             "error": str(e)
         })
 
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """Processing metrics endpoint"""
+    llm_cache = get_response_cache()
+    llm_agent = peek_service('llm_agent')
+    return jsonify({
+        # CPU pool workers keep their own lemma caches; this is the web process's
+        "lemma_cache_parent": get_normalizer().cache_stats(),
+        "llm_cache": llm_cache.stats() if llm_cache else None,
+        "retrieval_cache": llm_agent.cache_stats() if llm_agent else None,
+        "task_queue": task_queue.stats(),
+        "events": get_event_bus().stats(),
+        "db_pool": pool_stats()
+    })
+
 @app.route('/api/upload', methods=['POST'])
 def upload_files():
     """Upload files endpoint"""
@@ -448,7 +454,7 @@ def upload_files():
             # Create job record
             job = Job(
                 job_id=job_id,
-                status='created',
+                status='queued',
                 created_at=datetime.utcnow(),
                 total_students=0,
                 processed_students=0,
@@ -460,23 +466,21 @@ def upload_files():
             # Associate documents with job
             job.documents.append(csv_document)
             job.documents.append(job_desc_document)
-            session.commit()
             
-            # Process documents in the background
-            doc_processor = DocumentProcessor()
-            doc_processor.process_document(csv_document.id)
-            doc_processor.process_document(job_desc_document.id)
-            
-            # Start processing in background
-            threading.Thread(
-                target=process_files,
-                args=(job_id, csv_path, job_desc_path)
-            ).start()
+            # Queue ingestion; it enqueues generation when it completes
+            task_queue.enqueue(job.id, 'ingest', {
+                "job_id": job_id,
+                "csv_document_id": csv_document.id,
+                "job_desc_document_id": job_desc_document.id,
+                "csv_path": csv_path,
+                "job_desc_path": job_desc_path
+            }, session=session)
+            session.commit()
             
             return jsonify({
                 "job_id": job_id,
                 "status": "processing",
-                "message": "Files uploaded successfully and processing started"
+                "message": "Files uploaded successfully and queued for processing"
             })
             
         except Exception as e:
@@ -492,9 +496,30 @@ def upload_files():
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
+def fetch_page(query, id_column, after, limit):
+    """Fetch up to limit rows with id greater than after, ordered by id
+    
+    Returns:
+        Tuple of (rows, next_cursor), next_cursor is None on the last page
+    """
+    rows = query.filter(id_column > after).order_by(id_column).limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, rows[-1].id
+    return rows, None
+
 @app.route('/api/job/<job_id>', methods=['GET'])
 def get_job_status(job_id):
-    """Get job status endpoint"""
+    """Get job status endpoint
+    
+    Query parameters:
+        progress_only: Only return status and progress, without results or documents
+        since / cursor: Only return results with an ID greater than this
+            (results are returned while the job is still running when given)
+        documents_since: Only return documents with an ID greater than this
+        results_only: Skip documents (for paging through results)
+        limit: Page size for results and documents
+    """
     session = Session()
     try:
         # Get job from database
@@ -502,11 +527,25 @@ def get_job_status(job_id):
         if not job:
             return jsonify({"error": "Job not found"}), 404
         
-        # Get job results
+        response = job_progress(job)
+        if request.args.get('progress_only', 'false').lower() in ('true', '1'):
+            return jsonify(response)
+        
+        results_only = request.args.get('results_only', 'false').lower() in ('true', '1')
+        limit = max(1, min(request.args.get('limit', config.JOB_STATUS_PAGE_SIZE, type=int), config.JOB_STATUS_MAX_PAGE_SIZE))
+        since = request.args.get('since', request.args.get('cursor'), type=int)
+        
+        # Get job results, a page at a time
         results = []
-        if job.status == 'completed':
-            for result in job.results:
+        next_cursor = None
+        if job.status == 'completed' or since is not None:
+            rows, next_cursor = fetch_page(
+                session.query(JobResult).filter(JobResult.job_id == job.id),
+                JobResult.id, since or 0, limit
+            )
+            for result in rows:
                 results.append({
+                    'id': result.id,
                     'name': result.student_name,
                     'email': result.student_email,
                     'rollNumber': result.student_id,
@@ -515,9 +554,15 @@ def get_job_status(job_id):
                     'skills': result.skills
                 })
         
-        # Get generated documents
+        # Get generated documents (without their content)
         documents = []
-        for doc in job.generated_documents:
+        rows, documents_next_cursor = [], None
+        if not results_only:
+            rows, documents_next_cursor = fetch_page(
+                session.query(GeneratedDocument).filter(GeneratedDocument.job_id == job.id),
+                GeneratedDocument.id, request.args.get('documents_since', 0, type=int), limit
+            )
+        for doc in rows:
             documents.append({
                 'id': doc.id,
                 'student_email': doc.student_email,
@@ -528,16 +573,13 @@ def get_job_status(job_id):
                 'generated_at': doc.generated_at.isoformat()
             })
         
-        response = {
-            "job_id": job_id,
-            "status": job.status,
-            "created_at": job.created_at.isoformat(),
-            "completed_at": job.completed_at.isoformat() if job.completed_at else None,
-            "total_students": job.total_students,
-            "processed_students": job.processed_students,
+        response.update({
             "results": results,
-            "documents": documents
-        }
+            "next_cursor": next_cursor,
+            "last_result_id": results[-1]['id'] if results else since,
+            "documents": documents,
+            "documents_next_cursor": documents_next_cursor
+        })
         
         return jsonify(response)
     except Exception as e:
@@ -547,9 +589,185 @@ def get_job_status(job_id):
     finally:
         session.close()
 
+@app.route('/api/job/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    """Push job progress as server-sent events
+    
+    Sends the current progress as a 'status' event, then 'status' events on
+    status changes and a 'student' event as each student completes. The
+    stream ends after the job completes or fails.
+    """
+    # Subscribe before reading the snapshot so no event falls in between
+    subscription = get_event_bus().subscribe(job_id)
+    session = Session()
+    try:
+        job = session.query(Job).filter(Job.job_id == job_id).first()
+        if not job:
+            subscription.close()
+            return jsonify({"error": "Job not found"}), 404
+        snapshot = job_progress(job)
+    finally:
+        session.close()
+    
+    def events():
+        try:
+            yield sse_event('status', snapshot)
+            if snapshot['status'] in JOB_FINAL_STATUSES:
+                return
+            while True:
+                message = subscription.get(timeout=config.EVENT_KEEPALIVE_SECONDS)
+                if message is None:
+                    # Comment line keeps proxies from closing an idle stream
+                    yield ": keepalive\n\n"
+                    continue
+                yield sse_event(message['event'], message['data'])
+                if message['event'] == 'status' and message['data'].get('status') in JOB_FINAL_STATUSES:
+                    return
+        finally:
+            subscription.close()
+    
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+def export_members(session, job_db_id, formats, max_renders=None):
+    """Files of a job's documents in the given formats, as (archive name, path)
+    
+    Each student document appears once per format, under a folder named after
+    the format. Formats that were not rendered during the job (lazy mode), or
+    whose files are gone, come from the render cache, found by content hash.
+    Only content missing from the cache is loaded, in one query, so it can be
+    rendered with render_export after the session is closed.
+    
+    Args:
+        session: Database session
+        job_db_id: Job database ID
+        formats: Format types to include
+        max_renders: Most files that may need rendering (default: from config)
+        
+    Returns:
+        (members, renders): (archive name, path) of each file, and
+        (content, format type, content hash) of each file to render first
+        
+    Raises:
+        ValueError: If more than max_renders files need rendering
+    """
+    max_renders = config.EXPORT_MAX_RENDERS if max_renders is None else max_renders
+    documents = session.query(GeneratedDocument).filter(
+        GeneratedDocument.job_id == job_db_id
+    ).order_by(GeneratedDocument.id).all()
+    
+    # Latest row of each (document, format); all formats of a document share its content hash
+    by_stem = {}
+    for document in documents:
+        stem = os.path.splitext(os.path.basename(document.file_path))[0]
+        by_stem.setdefault(stem, {})[document.document_type] = document
+    
+    doc_generator = DocumentGenerator()
+    members = []
+    missing = set()
+    for stem, rows in by_stem.items():
+        for format_type in formats:
+            document = rows.get(format_type)
+            if document is not None and os.path.exists(document.file_path):
+                file_path = document.file_path
+            else:
+                digest = next((row.content_hash for row in rows.values() if row.content_hash), None)
+                if digest is None:
+                    continue
+                file_path = doc_generator.cached_render_path(digest, format_type)
+                if not os.path.exists(file_path):
+                    missing.add((digest, format_type))
+            members.append((f"{format_type}/{stem}.{FILE_EXTENSIONS[format_type]}", file_path))
+    
+    if len(missing) > max_renders:
+        raise ValueError(
+            f"Export needs {len(missing)} files rendered, more than the limit of {max_renders}; "
+            f"request fewer formats or download documents individually"
+        )
+    
+    contents = {}
+    if missing:
+        blobs = session.query(DocumentBlob).filter(DocumentBlob.hash.in_({digest for digest, _ in missing}))
+        contents = {blob.hash: blob.get_text() for blob in blobs}
+    renders = [(contents[digest], format_type, digest) for digest, format_type in missing if digest in contents]
+    return members, renders
+
+def render_export(renders):
+    """Render the files export_members found missing from the render cache"""
+    doc_generator = DocumentGenerator()
+    for future in [get_render_pool().submit(doc_generator.render_cached, *render) for render in renders]:
+        future.result()
+
+@app.route('/api/job/<job_id>/export', methods=['GET'])
+def export_job(job_id):
+    """Download a job's generated documents as one ZIP archive
+    
+    The archive is streamed as it is read, with a known length, so
+    downloads can be resumed with HTTP range requests. The formats query
+    parameter is a comma-separated subset of markdown, pdf and docx
+    (default: all).
+    """
+    formats = [f.strip() for f in request.args.get('formats', ','.join(FORMATS)).split(',') if f.strip()]
+    unsupported = [f for f in formats if f not in FILE_EXTENSIONS]
+    if not formats or unsupported:
+        return jsonify({"error": f"Unsupported format type: {', '.join(unsupported) or 'none'}"}), 400
+    
+    session = Session()
+    try:
+        job = session.query(Job).filter(Job.job_id == job_id).first()
+        if not job:
+            return jsonify({"error": "Job not found"}), 404
+        members, renders = export_members(session, job.id, formats)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 413
+    finally:
+        session.close()
+    
+    try:
+        render_export(renders)
+        plan = ZipPlan(members)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 413
+    
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": f'"{plan.etag}"',
+        "Content-Disposition": f'attachment; filename="job-{job_id}.zip"'
+    }
+    
+    # Serve a single byte range when asked for one that still matches this
+    # archive (multipart ranges get the whole archive)
+    status, start, stop = 200, 0, plan.size
+    byte_range_requested = request.range is not None and len(request.range.ranges) == 1
+    if byte_range_requested and ('If-Range' not in request.headers or request.if_range.etag == plan.etag):
+        byte_range = request.range.range_for_length(plan.size)
+        if byte_range is None:
+            headers["Content-Range"] = f"bytes */{plan.size}"
+            return Response(status=416, headers=headers)
+        status, (start, stop) = 206, byte_range
+        headers["Content-Range"] = f"bytes {start}-{stop - 1}/{plan.size}"
+    headers["Content-Length"] = str(stop - start)
+    
+    return Response(
+        plan.iter_bytes(start, stop),
+        status=status,
+        headers=headers,
+        mimetype='application/zip',
+        direct_passthrough=True
+    )
+
 @app.route('/api/document/<int:document_id>', methods=['GET'])
 def get_document(document_id):
-    """Get generated document endpoint"""
+    """Get generated document endpoint
+    
+    The optional format query parameter ('markdown', 'pdf', 'docx') asks for
+    another format of the same document. Formats that were not rendered
+    during the job are rendered from the stored markdown on first request
+    and served from the render cache afterwards.
+    """
     session = Session()
     try:
         # Get document from database
@@ -557,15 +775,24 @@ def get_document(document_id):
         if not document:
             return jsonify({"error": "Document not found"}), 404
         
-        # Check if file exists
-        if not os.path.exists(document.file_path):
-            return jsonify({"error": "Document file not found"}), 404
+        format_type = request.args.get('format', document.document_type)
+        if format_type not in FILE_EXTENSIONS:
+            return jsonify({"error": f"Unsupported format type: {format_type}"}), 400
+        
+        download_name = f"{os.path.splitext(os.path.basename(document.file_path))[0]}.{FILE_EXTENSIONS[format_type]}"
+        
+        # Serve the file rendered during the job when there is one
+        file_path = document.file_path if format_type == document.document_type else None
+        if not file_path or not os.path.exists(file_path):
+            if not document.content:
+                return jsonify({"error": "Document file not found"}), 404
+            file_path = DocumentGenerator().render_cached(document.content, format_type, document.content_hash)
         
         # Return file
         return send_file(
-            document.file_path,
+            file_path,
             as_attachment=True,
-            download_name=os.path.basename(document.file_path)
+            download_name=download_name
         )
     except Exception as e:
         logger.error(f"Error getting document: {e}")
@@ -591,7 +818,9 @@ def get_student_documents(email):
     session = Session()
     try:
         # Get documents from database
-        documents = session.query(GeneratedDocument).filter(GeneratedDocument.student_email == email).all()
+        documents = session.query(GeneratedDocument).filter(
+            GeneratedDocument.student_email == email
+        ).order_by(GeneratedDocument.generated_at).all()
         
         # Format response
         results = []
@@ -636,14 +865,13 @@ def generate_document():
             if not job:
                 return jsonify({"error": "Job not found"}), 404
             
-            # Initialize LLM agent
-            llm_agent = LLMAgent()
-            
             # Generate personalized document
-            document_content = llm_agent.generate_personalized_document(
+            document_content = get_llm_agent().generate_personalized_document(
                 student_email=data['student_email'],
                 company=data['company'],
-                role=data['role']
+                role=data['role'],
+                force_regenerate=bool(data.get('force_regenerate', False)),
+                **job_document_ids(job)
             )
             
             # Initialize document generator
@@ -679,5 +907,75 @@ def generate_document():
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
+def sse_event(event, data):
+    """Format a server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.route('/api/generate/document/stream', methods=['GET', 'POST'])
+def stream_document():
+    """Stream document generation as server-sent events
+    
+    Emits 'token' events as the LLM produces text, then a 'done' event
+    (with the saved document when a format is requested) or an 'error' event.
+    """
+    data = request.get_json(silent=True) or request.args.to_dict()
+    
+    # Check required fields
+    required_fields = ['student_email', 'company', 'role', 'job_id']
+    for field in required_fields:
+        if field not in data:
+            return jsonify({"error": f"Missing required field: {field}"}), 400
+    
+    # Get job
+    session = Session()
+    try:
+        job = session.query(Job).filter(Job.job_id == data['job_id']).first()
+        if not job:
+            return jsonify({"error": "Job not found"}), 404
+        job_db_id = job.id
+        document_ids = job_document_ids(job)
+    finally:
+        session.close()
+    
+    def events():
+        content = []
+        try:
+            for token in get_llm_agent().stream_personalized_document(
+                student_email=data['student_email'],
+                company=data['company'],
+                role=data['role'],
+                **document_ids
+            ):
+                content.append(token)
+                yield sse_event('token', {"text": token})
+            
+            result = {}
+            if data.get('format'):
+                # Save the finished document in the requested format
+                doc_generator = DocumentGenerator()
+                result = doc_generator.generate_document(
+                    content=''.join(content),
+                    student_email=data['student_email'],
+                    company=data['company'],
+                    role=data['role'],
+                    job_id=job_db_id,
+                    format_type=data['format']
+                )
+                if 'error' in result:
+                    yield sse_event('error', {"error": result['error']})
+                    return
+            
+            yield sse_event('done', result)
+        except Exception as e:
+            logger.error(f"Error streaming document: {e}")
+            traceback.print_exc()
+            yield sse_event('error', {"error": str(e)})
+    
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=config.PORT, debug=config.DEBUG)
\ No newline at end of file
@@ -0,0 +1,110 @@
+import time
+import logging
+import threading
+from typing import Dict, Any, List
+
+import config
+from models import Job, DocumentBlob, session_scope, insert_ignore
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Content-addressed models: written before the rows that reference them,
+# skipping rows whose key already exists
+DEDUPLICATED_MODELS = (DocumentBlob,)
+
+class BatchWriter:
+    """Buffer rows and job progress, and write them in bulk
+    
+    add() and set_progress() are thread-safe and only buffer. The owner
+    calls maybe_flush() regularly, which writes every buffered row with one
+    bulk insert per model, plus the latest progress, in a single commit once
+    flush_rows rows are buffered or flush_ms milliseconds have passed.
+    """
+    
+    def __init__(self, flush_rows: int = None, flush_ms: int = None):
+        """Initialize the writer
+        
+        Args:
+            flush_rows: Buffered rows that trigger a flush (default: from config)
+            flush_ms: Milliseconds between flushes (default: from config)
+        """
+        self.flush_rows = flush_rows or config.RESULT_FLUSH_ROWS
+        self.flush_seconds = (flush_ms or config.RESULT_FLUSH_MS) / 1000
+        self._rows = {}
+        self._row_count = 0
+        self._progress = {}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self.flushes = 0
+    
+    def add(self, model, row: Dict[str, Any]):
+        """Buffer a row for bulk insert
+        
+        Args:
+            model: Model class, e.g. JobResult
+            row: Column values
+        """
+        with self._lock:
+            self._rows.setdefault(model, []).append(row)
+            self._row_count += 1
+    
+    def add_many(self, model, rows: List[Dict[str, Any]]):
+        """Buffer rows that must be written in the same flush
+        
+        Args:
+            model: Model class, e.g. GeneratedDocument
+            rows: Column values of each row
+        """
+        with self._lock:
+            self._rows.setdefault(model, []).extend(rows)
+            self._row_count += len(rows)
+    
+    def set_progress(self, job_id: int, processed_students: int):
+        """Record a job's progress (written with the next flush)
+        
+        Args:
+            job_id: Database ID of the job
+            processed_students: Number of processed students
+        """
+        with self._lock:
+            self._progress[job_id] = processed_students
+    
+    def maybe_flush(self) -> bool:
+        """Flush if enough rows are buffered or enough time has passed
+        
+        Returns:
+            True if a flush happened
+        """
+        with self._lock:
+            due = self._row_count >= self.flush_rows or time.monotonic() - self._last_flush >= self.flush_seconds
+        if due:
+            self.flush()
+        return due
+    
+    def flush(self):
+        """Write all buffered rows and progress in one transaction"""
+        with self._lock:
+            rows, self._rows = self._rows, {}
+            progress, self._progress = self._progress, {}
+            self._row_count = 0
+            self._last_flush = time.monotonic()
+        
+        if not rows and not progress:
+            return
+        
+        with session_scope() as session:
+            for model in DEDUPLICATED_MODELS:
+                insert_ignore(session, model, list({row['hash']: row for row in rows.pop(model, [])}.values()))
+            for model, mappings in rows.items():
+                session.bulk_insert_mappings(model, mappings)
+            for job_id, processed_students in progress.items():
+                session.query(Job).filter(Job.id == job_id).update(
+                    {Job.processed_students: processed_students}, synchronize_session=False
+                )
+        self.flushes += 1
+    
+    def close(self):
+        """Flush anything still buffered"""
+        self.flush()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark the CPU process pool on a synthetic student CSV
+
+Runs skill extraction for the whole cohort (score_cohort) with 1, 2, 4, ...
+worker processes up to the core count and reports rows/sec and speedup
+over inline processing. Pass --pdf to also time PDF text extraction.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cpu_pool import CPUPool
+from skill_analysis.scoring import score_cohort
+from text_extraction import extract_pdf_text
+from bench_skill_matcher import make_csv
+
+def worker_counts(max_workers):
+    """1, 2, 4, ... up to max_workers, always including max_workers"""
+    counts = []
+    workers = 1
+    while workers < max_workers:
+        counts.append(workers)
+        workers *= 2
+    counts.append(max_workers)
+    return counts
+
+def time_call(fn):
+    """Run fn once and return its elapsed time"""
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=50000, help='Number of synthetic students')
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1, help='Largest pool to try')
+    parser.add_argument('--pdf', help='PDF file to time text extraction on')
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'students.csv')
+        make_csv(csv_path, args.rows)
+        df = pd.read_csv(csv_path)
+    
+    job_skills = {'technical': ['python', 'sql', 'machine learning']}
+    print(f"Scoring {len(df):,} rows\n")
+    print(f"{'workers':>7} {'seconds':>9} {'rows/sec':>12} {'speedup':>8}")
+    
+    baseline = None
+    for workers in worker_counts(args.max_workers):
+        pool = CPUPool(workers)
+        # Warm up so process start-up and imports are not timed
+        score_cohort(df.head(pool.workers * 2000), job_skills, pool=pool)
+        elapsed = time_call(lambda: score_cohort(df, job_skills, pool=pool))
+        pool.shutdown()
+        baseline = baseline or elapsed
+        print(f"{workers:>7} {elapsed:>9.2f} {len(df) / elapsed:>12,.0f} {baseline / elapsed:>7.1f}x")
+    
+    if args.pdf:
+        print(f"\nExtracting text from {args.pdf}\n")
+        print(f"{'workers':>7} {'seconds':>9} {'speedup':>8}")
+        baseline = None
+        for workers in worker_counts(args.max_workers):
+            pool = CPUPool(workers)
+            extract_pdf_text(args.pdf, pool=pool)
+            elapsed = time_call(lambda: extract_pdf_text(args.pdf, pool=pool))
+            pool.shutdown()
+            baseline = baseline or elapsed
+            print(f"{workers:>7} {elapsed:>9.2f} {baseline / elapsed:>7.1f}x")
+    
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Benchmark the job status and student documents lookups with and without indexes
+
+Seeds a database with jobs, job results and generated documents, runs the
+queries behind GET /api/job/<job_id> and GET /api/student/<email>/documents
+without the hot lookup indexes, applies the index migration and runs them
+again, reporting p50/p99 latency for each.
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import statistics
+from datetime import datetime, timedelta
+from sqlalchemy import text
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+
+def seed(engine, models, jobs, results_per_job, students, batch_size=20000, seed=42):
+    """Insert jobs, one result and one generated document per job student"""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    with engine.begin() as connection:
+        connection.execute(models.Job.__table__.insert(), [
+            {
+                'id': i + 1,
+                'job_id': f'job-{i}',
+                'status': 'completed',
+                'created_at': now - timedelta(minutes=jobs - i),
+                'total_students': results_per_job,
+                'processed_students': results_per_job
+            }
+            for i in range(jobs)
+        ])
+    
+    results, documents = [], []
+    for job in range(1, jobs + 1):
+        for _ in range(results_per_job):
+            email = f'student{rng.randrange(students)}@example.com'
+            results.append({
+                'job_id': job,
+                'student_name': email.split('@')[0],
+                'student_email': email,
+                'student_id': email[7:-12],
+                'status': 'Success',
+                'match_score': rng.random() * 100,
+                'skills': {'technical': ['python', 'sql']}
+            })
+            documents.append({
+                'job_id': job,
+                'student_email': email,
+                'company': 'Acme',
+                'role': 'Engineer',
+                'document_type': 'markdown',
+                'file_path': f'/outputs/{email}_Acme_Engineer.md',
+                'generated_at': now
+            })
+            if len(results) >= batch_size:
+                with engine.begin() as connection:
+                    connection.execute(models.JobResult.__table__.insert(), results)
+                    connection.execute(models.GeneratedDocument.__table__.insert(), documents)
+                results, documents = [], []
+    if results:
+        with engine.begin() as connection:
+            connection.execute(models.JobResult.__table__.insert(), results)
+            connection.execute(models.GeneratedDocument.__table__.insert(), documents)
+
+def job_status_query(session, models, job_id):
+    """What GET /api/job/<job_id> loads"""
+    job = session.query(models.Job).filter(models.Job.job_id == job_id).first()
+    return len(job.results) + len(job.generated_documents)
+
+def student_documents_query(session, models, email):
+    """What GET /api/student/<email>/documents loads"""
+    return len(session.query(models.GeneratedDocument).filter(
+        models.GeneratedDocument.student_email == email
+    ).order_by(models.GeneratedDocument.generated_at).all())
+
+def measure(models, query, keys):
+    """Run query once per key in a fresh session and return latencies in ms"""
+    latencies = []
+    for key in keys:
+        session = models.Session()
+        try:
+            start = time.perf_counter()
+            query(session, models, key)
+            latencies.append((time.perf_counter() - start) * 1000)
+        finally:
+            session.close()
+    return latencies
+
+def percentiles(latencies):
+    """p50 and p99 of a list of latencies"""
+    cuts = statistics.quantiles(latencies, n=100)
+    return cuts[49], cuts[98]
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--db-url', help='Database to seed (default: a temporary SQLite file)')
+    parser.add_argument('--jobs', type=int, default=1000, help='Number of jobs')
+    parser.add_argument('--results-per-job', type=int, default=1000, help='Results (and documents) per job')
+    parser.add_argument('--students', type=int, default=100000, help='Distinct student emails')
+    parser.add_argument('--queries', type=int, default=200, help='Queries per endpoint and phase')
+    args = parser.parse_args()
+    
+    tmp = tempfile.TemporaryDirectory()
+    config.DB_URL = args.db_url or f"sqlite:///{os.path.join(tmp.name, 'bench.db')}"
+    
+    import models
+    from migrations import v001_hot_lookup_indexes
+    from migrations.runner import migrate
+    
+    models.Base.metadata.drop_all(models.engine)
+    models.Base.metadata.create_all(models.engine)
+    with models.engine.begin() as connection:
+        v001_hot_lookup_indexes.downgrade(connection)
+        connection.execute(text("DROP TABLE IF EXISTS schema_migrations"))
+    
+    total = args.jobs * args.results_per_job
+    print(f"Seeding {args.jobs:,} jobs, {total:,} results and {total:,} documents...")
+    start = time.perf_counter()
+    seed(models.engine, models, args.jobs, args.results_per_job, args.students)
+    print(f"Seeded in {time.perf_counter() - start:.1f}s\n")
+    
+    rng = random.Random(7)
+    job_ids = [f'job-{rng.randrange(args.jobs)}' for _ in range(args.queries)]
+    emails = [f'student{rng.randrange(args.students)}@example.com' for _ in range(args.queries)]
+    endpoints = [
+        ('/api/job/<job_id>', job_status_query, job_ids),
+        ('/api/student/<email>/documents', student_documents_query, emails),
+    ]
+    
+    before = {name: percentiles(measure(models, query, keys)) for name, query, keys in endpoints}
+    start = time.perf_counter()
+    migrate(models.engine)
+    print(f"Applied index migration in {time.perf_counter() - start:.1f}s\n")
+    after = {name: percentiles(measure(models, query, keys)) for name, query, keys in endpoints}
+    
+    print(f"{'endpoint':<32} {'p50 before':>11} {'p50 after':>10} {'p99 before':>11} {'p99 after':>10}")
+    for name, _, _ in endpoints:
+        print(f"{name:<32} {before[name][0]:>9.2f}ms {after[name][0]:>8.2f}ms {before[name][1]:>9.2f}ms {after[name][1]:>8.2f}ms")
+    
+    models.engine.dispose()
+    tmp.cleanup()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
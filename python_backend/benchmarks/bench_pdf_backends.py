@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark the PDF backends on synthetic generated documents
+
+Renders the same set of markdown documents with each PDF backend, from a
+fresh process per backend, using the document generator's render threads,
+and reports PDFs/sec plus the peak resident memory of the benchmark
+process and of its renderer processes.
+"""
+
+import os
+import sys
+import time
+import resource
+import argparse
+import tempfile
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+
+SAMPLE_DOCUMENT = """---
+student_name: Student {i}
+student_email: student{i}@example.com
+company: Acme
+role: Data Engineer
+---
+
+# Personalized Application Guide for Student {i}
+
+## Introduction
+Student {i} brings **strong Python and SQL skills** to the *Data Engineer* role at Acme.
+
+## Skills Match
+- Python, pandas and `numpy` for data processing
+- SQL and PostgreSQL for analytics
+- Docker for reproducible environments
+
+## Suggestions
+1. Highlight the ETL pipeline built during the internship
+2. Quantify query performance improvements
+3. Mention experience with cloud storage
+
+## Areas to Prepare
+- Streaming systems such as Kafka
+- Orchestration with Airflow
+
+## Next Steps
+Review the job description again and tailor the resume summary before applying.
+"""
+
+def run_backend(name, documents, threads, output_dir, results):
+    """Render every document with one backend and record throughput and memory"""
+    config.PDF_BACKEND = name
+    from document_generator.document_tree import markdown_to_html
+    from document_generator.pdf_backends import build_pdf_backend
+    
+    try:
+        backend = build_pdf_backend(name)
+    except Exception as e:
+        results[name] = {"error": str(e)}
+        return
+    
+    htmls = [markdown_to_html(SAMPLE_DOCUMENT.format(i=i)) for i in range(documents)]
+    paths = [os.path.join(output_dir, f'{name}-{i}.pdf') for i in range(documents)]
+    
+    start = time.perf_counter()
+    errors = 0
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for future in [executor.submit(backend.render, html, path) for html, path in zip(htmls, paths)]:
+            try:
+                future.result()
+            except Exception:
+                errors += 1
+    elapsed = time.perf_counter() - start
+    backend.close()
+    
+    # ru_maxrss is in kilobytes on Linux; for children it is the largest single process
+    results[name] = {
+        "pdfs_per_sec": (documents - errors) / elapsed,
+        "errors": errors,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "peak_child_rss_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    }
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--documents', type=int, default=200, help='Documents rendered per backend')
+    parser.add_argument('--threads', type=int, default=config.RENDER_WORKERS, help='Concurrent render calls')
+    parser.add_argument('--backends', default='wkhtmltopdf,wkhtmltopdf-batch,xhtml2pdf', help='Comma-separated backends')
+    args = parser.parse_args()
+    
+    context = multiprocessing.get_context('spawn')
+    manager = context.Manager()
+    results = manager.dict()
+    
+    with tempfile.TemporaryDirectory() as output_dir:
+        for name in [b.strip() for b in args.backends.split(',') if b.strip()]:
+            print(f"Rendering {args.documents} documents with '{name}'...")
+            process = context.Process(target=run_backend, args=(name, args.documents, args.threads, output_dir, results))
+            process.start()
+            process.join()
+    
+    print(f"\n{'backend':<20} {'PDFs/sec':>10} {'errors':>7} {'peak RSS':>10} {'peak renderer RSS':>18}")
+    for name, result in results.items():
+        if 'error' in result:
+            print(f"{name:<20} unavailable: {result['error']}")
+            continue
+        print(f"{name:<20} {result['pdfs_per_sec']:>10.1f} {result['errors']:>7} "
+              f"{result['peak_rss_mb']:>8.1f}MB {result['peak_child_rss_mb']:>16.1f}MB")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
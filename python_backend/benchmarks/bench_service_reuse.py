@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-student service setup overhead
+
+Compares building a new LLMAgent (embedding model + Chroma client) for every
+student, as process_files used to, with the shared service registry.
+"""
+
+import os
+import sys
+import time
+import argparse
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import services
+from llm_agent.agent import LLMAgent
+
+def per_student_agents(students):
+    """Build a fresh agent for every student"""
+    for _ in range(students):
+        LLMAgent()
+
+def shared_agent(students):
+    """Fetch the shared agent for every student"""
+    services.reset()
+    for _ in range(students):
+        services.get_llm_agent()
+
+def run(name, fn, students):
+    """Time a setup strategy"""
+    start = time.perf_counter()
+    fn(students)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<20} {elapsed:8.2f}s total  {elapsed / students * 1000:10.1f} ms/student")
+    return elapsed
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--students', type=int, default=20, help='Number of simulated students')
+    args = parser.parse_args()
+    
+    print(f"Setting up services for {args.students} students\n")
+    before = run('new agent/student', per_student_agents, args.students)
+    after = run('shared registry', shared_agent, args.students)
+    
+    print(f"\n✅ Shared services cut setup overhead by {before / after:.0f}x")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,6 +15,13 @@ OLLAMA_MODEL = os.getenv('OLLAMA_MODEL', 'phi:mini')
 OLLAMA_ALTERNATIVE_MODEL = os.getenv('OLLAMA_ALTERNATIVE_MODEL', 'mistral:latest')
 EMBEDDING_MODEL = os.getenv('EMBEDDING_MODEL', 'nomic-embed-text')
 
+# Ollama HTTP client
+OLLAMA_POOL_SIZE = int(os.getenv('OLLAMA_POOL_SIZE', 16))
+OLLAMA_CONNECT_TIMEOUT = float(os.getenv('OLLAMA_CONNECT_TIMEOUT', 5))
+OLLAMA_READ_TIMEOUT = float(os.getenv('OLLAMA_READ_TIMEOUT', 300))
+OLLAMA_MAX_RETRIES = int(os.getenv('OLLAMA_MAX_RETRIES', 3))
+OLLAMA_RETRY_BACKOFF = float(os.getenv('OLLAMA_RETRY_BACKOFF', 0.5))
+
 # Database configuration
 DB_HOST = os.getenv('POSTGRES_HOST', 'localhost')
 DB_PORT = int(os.getenv('POSTGRES_PORT', 3799))
@@ -23,22 +30,106 @@ DB_USER = os.getenv('POSTGRES_USER', 'postgres')
 DB_PASSWORD = os.getenv('POSTGRES_PASSWORD', 'postgres')
 DB_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
+# Database connection pool (per process)
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 20))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 30))
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))
+DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 30000))  # 0 disables
+
 # File paths
 UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
 OUTPUT_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'outputs')
 DATA_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
 VECTOR_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'vector_db')
+CACHE_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
+RENDER_CACHE_FOLDER = os.getenv('RENDER_CACHE_FOLDER', os.path.join(CACHE_FOLDER, 'renders'))
 
 # Create folders if they don't exist
-for folder in [UPLOAD_FOLDER, OUTPUT_FOLDER, DATA_FOLDER, VECTOR_DB_PATH]:
+for folder in [UPLOAD_FOLDER, OUTPUT_FOLDER, DATA_FOLDER, VECTOR_DB_PATH, CACHE_FOLDER, RENDER_CACHE_FOLDER]:
     if not os.path.exists(folder):
         os.makedirs(folder)
 
 # Document processing
 CHUNK_SIZE = 1000
 CHUNK_OVERLAP = 200
+INGEST_BATCH_SIZE = int(os.getenv('INGEST_BATCH_SIZE', 256))  # Rows embedded and inserted per batch
 MAX_TOKENS = 4096  # For context window
 
+# LLM response cache
+LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', 'true').lower() == 'true'
+LLM_CACHE_PATH = os.getenv('LLM_CACHE_PATH', os.path.join(CACHE_FOLDER, 'llm_responses.sqlite3'))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv('LLM_CACHE_MAX_ENTRIES', 100000))
+LLM_CACHE_MEMORY_ENTRIES = int(os.getenv('LLM_CACHE_MEMORY_ENTRIES', 1000))
+LLM_CACHE_TTL_SECONDS = int(os.getenv('LLM_CACHE_TTL_SECONDS', 30 * 24 * 3600))
+
+# Background task queue
+TASK_WORKERS = int(os.getenv('TASK_WORKERS', 2))  # 0 disables the in-process worker pool
+TASK_POLL_INTERVAL = float(os.getenv('TASK_POLL_INTERVAL', 1.0))
+TASK_LEASE_SECONDS = int(os.getenv('TASK_LEASE_SECONDS', 120))
+TASK_HEARTBEAT_SECONDS = int(os.getenv('TASK_HEARTBEAT_SECONDS', 30))
+TASK_MAX_ATTEMPTS = int(os.getenv('TASK_MAX_ATTEMPTS', 3))
+
+# Job results and generated documents are bulk inserted every N rows or T milliseconds
+RESULT_FLUSH_ROWS = int(os.getenv('RESULT_FLUSH_ROWS', 100))
+RESULT_FLUSH_MS = int(os.getenv('RESULT_FLUSH_MS', 1000))
+
+# Page size of results and documents in GET /api/job/<job_id>
+JOB_STATUS_PAGE_SIZE = int(os.getenv('JOB_STATUS_PAGE_SIZE', 1000))
+JOB_STATUS_MAX_PAGE_SIZE = int(os.getenv('JOB_STATUS_MAX_PAGE_SIZE', 5000))
+
+# Job progress events ('postgres' uses LISTEN/NOTIFY to reach every worker process)
+EVENT_BACKEND = os.getenv('EVENT_BACKEND', 'postgres' if DB_URL.startswith('postgresql') else 'local')
+EVENT_QUEUE_SIZE = int(os.getenv('EVENT_QUEUE_SIZE', 1000))
+EVENT_KEEPALIVE_SECONDS = float(os.getenv('EVENT_KEEPALIVE_SECONDS', 15))
+EVENT_FLUSH_MS = int(os.getenv('EVENT_FLUSH_MS', 250))  # Longest delay of per-student events
+EVENT_LISTEN_TIMEOUT_SECONDS = float(os.getenv('EVENT_LISTEN_TIMEOUT_SECONDS', 5))
+
+# Entries in the in-memory caches of student records and job description context
+RETRIEVAL_CACHE_SIZE = int(os.getenv('RETRIEVAL_CACHE_SIZE', 10000))
+
+# Job export archives (GET /api/job/<job_id>/export)
+EXPORT_CHUNK_BYTES = int(os.getenv('EXPORT_CHUNK_BYTES', 1024 * 1024))
+EXPORT_CRC_CACHE_SIZE = int(os.getenv('EXPORT_CRC_CACHE_SIZE', 100000))
+EXPORT_MAX_RENDERS = int(os.getenv('EXPORT_MAX_RENDERS', 200))  # Files an export may render on demand
+
+# Student CSVs are streamed in batches of this many rows
+CSV_CHUNK_ROWS = int(os.getenv('CSV_CHUNK_ROWS', 5000))
+
+# CPU-bound extraction and skill analysis (0 or 1 runs inline)
+CPU_WORKERS = int(os.getenv('CPU_WORKERS', os.cpu_count() or 1))
+CPU_SHARD_SIZE = int(os.getenv('CPU_SHARD_SIZE', 1000))  # CSV rows per shard
+CPU_PDF_PAGES_PER_SHARD = int(os.getenv('CPU_PDF_PAGES_PER_SHARD', 8))
+
+# Concurrent generation (match OLLAMA_NUM_PARALLEL on the Ollama server)
+GENERATION_WORKERS = int(os.getenv('GENERATION_WORKERS', 4))
+GENERATION_MAX_IN_FLIGHT = int(os.getenv('GENERATION_MAX_IN_FLIGHT', GENERATION_WORKERS * 2))
+
+# 'eager' renders every format during a job; 'lazy' stores only markdown and
+# renders PDF/DOCX on first download, caching them in RENDER_CACHE_FOLDER
+DOCUMENT_RENDER_MODE = os.getenv('DOCUMENT_RENDER_MODE', 'eager')
+
+# Threads rendering PDF and DOCX documents concurrently (per process)
+RENDER_WORKERS = int(os.getenv('RENDER_WORKERS', 8))
+
+# PDF rendering: 'wkhtmltopdf' (one process per document), 'wkhtmltopdf-batch'
+# (PDF_WORKERS processes converting up to PDF_BATCH_SIZE documents each) or
+# 'xhtml2pdf' (pure Python, no external binary)
+PDF_BACKEND = os.getenv('PDF_BACKEND', 'wkhtmltopdf')
+WKHTMLTOPDF_PATH = os.getenv('WKHTMLTOPDF_PATH', 'wkhtmltopdf')
+PDF_WORKERS = int(os.getenv('PDF_WORKERS', 2))
+PDF_BATCH_SIZE = int(os.getenv('PDF_BATCH_SIZE', 32))
+PDF_BATCH_MS = int(os.getenv('PDF_BATCH_MS', 100))
+PDF_BATCH_TIMEOUT_SECONDS = int(os.getenv('PDF_BATCH_TIMEOUT_SECONDS', 300))
+
+# Skill extraction ('vocabulary' always runs, 'entities' adds spaCy NER)
+SKILL_EXTRACTORS = [name.strip() for name in os.getenv('SKILL_EXTRACTORS', 'vocabulary').split(',') if name.strip()]
+SPACY_MODEL = os.getenv('SPACY_MODEL', 'en_core_web_sm')
+SPACY_BATCH_SIZE = int(os.getenv('SPACY_BATCH_SIZE', 256))
+LEMMA_CACHE_SIZE = int(os.getenv('LEMMA_CACHE_SIZE', 50000))
+SPACY_ENTITY_LABELS = [label.strip() for label in os.getenv('SPACY_ENTITY_LABELS', 'PRODUCT,LANGUAGE').split(',') if label.strip()]
+
 # Allowed file extensions
 ALLOWED_EXTENSIONS = {
     'csv': ['csv'],
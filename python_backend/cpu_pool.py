@@ -0,0 +1,128 @@
+import os
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, List, Any, Optional
+
+import config
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def _run_inline(fn: Callable[[List[Any]], List[Any]], shards: List[List[Any]]) -> List[Any]:
+    """Run a shard function over every shard in this process"""
+    results = []
+    for shard in shards:
+        results.extend(fn(shard))
+    return results
+
+class CPUPool:
+    """Process pool for CPU-bound work such as text extraction and skill analysis
+    
+    Work is split into shards that run in worker processes, outside the GIL
+    of the web server. Workers are started with the spawn method, so they
+    never inherit the server's threads, locks or open connections.
+    """
+    
+    def __init__(self, workers: int = None):
+        """Initialize the pool (worker processes start on first use)
+        
+        Args:
+            workers: Number of worker processes, 0 or 1 to run inline (default: from config)
+        """
+        self.workers = config.CPU_WORKERS if workers is None else workers
+        self._executor = None
+        self._lock = threading.Lock()
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Get the executor, starting it if needed"""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    logger.info(f"Starting CPU pool with {self.workers} processes")
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context('spawn')
+                    )
+        return self._executor
+    
+    def map_shards(self, fn: Callable[[List[Any]], List[Any]], items: List[Any], shard_size: int = None) -> List[Any]:
+        """Apply a shard function to items split into shards
+        
+        Args:
+            fn: Picklable module-level function taking a list of items and
+                returning one result per item
+            items: Items to process
+            shard_size: Items per shard (default: config.CPU_SHARD_SIZE)
+            
+        Returns:
+            Results for every item, in input order
+        """
+        items = list(items)
+        shard_size = max(1, shard_size or config.CPU_SHARD_SIZE)
+        shards = [items[i:i + shard_size] for i in range(0, len(items), shard_size)]
+        
+        # Not worth a round trip to another process
+        if self.workers <= 1 or len(shards) <= 1:
+            return _run_inline(fn, shards)
+        
+        try:
+            results = []
+            for shard_results in self._get_executor().map(fn, shards):
+                results.extend(shard_results)
+            return results
+        except BrokenProcessPool as e:
+            logger.error(f"CPU pool broke, running inline: {e}")
+            self.shutdown()
+            return _run_inline(fn, shards)
+    
+    def submit(self, fn: Callable[..., Any], *args) -> Any:
+        """Run a single picklable function call in the pool and wait for it
+        
+        Args:
+            fn: Picklable module-level function
+            *args: Picklable arguments
+            
+        Returns:
+            The function's return value
+        """
+        if self.workers <= 1:
+            return fn(*args)
+        
+        try:
+            return self._get_executor().submit(fn, *args).result()
+        except BrokenProcessPool as e:
+            logger.error(f"CPU pool broke, running inline: {e}")
+            self.shutdown()
+            return fn(*args)
+    
+    def shutdown(self):
+        """Stop the worker processes (the next call starts new ones)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+_cpu_pool = None
+_cpu_pool_lock = threading.Lock()
+
+def get_cpu_pool() -> CPUPool:
+    """Get the process-wide CPU pool"""
+    global _cpu_pool
+    if _cpu_pool is None:
+        with _cpu_pool_lock:
+            if _cpu_pool is None:
+                _cpu_pool = CPUPool()
+    return _cpu_pool
+
+def _reset_after_fork():
+    """Drop the parent's pool in a forked child"""
+    global _cpu_pool, _cpu_pool_lock
+    _cpu_pool = None
+    _cpu_pool_lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,43 @@
+import logging
+import pandas as pd
+from typing import Iterator
+
+import config
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def iter_csv_batches(csv_path: str, chunk_rows: int = None) -> Iterator[pd.DataFrame]:
+    """Read a CSV file in row batches
+    
+    Only one batch is held in memory at a time. Batches keep the file's row
+    numbers as their index, so batch.index[0] is the position of the first
+    row in the whole file. A CSV with only a header yields no batches.
+    
+    Args:
+        csv_path: Path to the CSV file
+        chunk_rows: Rows per batch (default: from config)
+        
+    Yields:
+        DataFrames of at most chunk_rows rows
+    """
+    with pd.read_csv(csv_path, chunksize=chunk_rows or config.CSV_CHUNK_ROWS) as reader:
+        for batch in reader:
+            # pandas yields one empty chunk for a header-only file
+            if batch.empty:
+                continue
+            yield batch
+
+def count_csv_rows(csv_path: str, chunk_rows: int = None) -> int:
+    """Count the data rows of a CSV file without loading it
+    
+    Args:
+        csv_path: Path to the CSV file
+        chunk_rows: Rows per batch (default: from config)
+        
+    Returns:
+        Number of rows
+    """
+    with pd.read_csv(csv_path, usecols=[0], chunksize=chunk_rows or config.CSV_CHUNK_ROWS) as reader:
+        return sum(len(batch) for batch in reader)
@@ -0,0 +1,117 @@
+import re
+import markdown2
+from docx import Document as DocxDocument
+from typing import Dict, Any, List
+
+# Inline spans: **bold**, __bold__, *italic*, _italic_ and `code`
+INLINE_PATTERN = re.compile(r'(\*\*[^*]+\*\*|__[^_]+__|`[^`]+`|\*[^*\s][^*]*\*|\b_[^_\s][^_]*_\b)')
+NUMBERED_PATTERN = re.compile(r'^\d+[.)] ')
+RULE_PATTERN = re.compile(r'^(-{3,}|\*{3,}|_{3,})$')
+
+# markdown2 extras used for PDF HTML
+MARKDOWN_EXTRAS = ['tables', 'fenced-code-blocks']
+
+def parse_inline(text: str) -> List[Dict[str, Any]]:
+    """Split a line into runs of plain, bold, italic and code text
+    
+    Args:
+        text: Line of markdown without block markup
+        
+    Returns:
+        List of runs ({"text", "bold", "italic", "code"})
+    """
+    runs = []
+    for part in INLINE_PATTERN.split(text):
+        if not part:
+            continue
+        run = {"text": part, "bold": False, "italic": False, "code": False}
+        if part[:2] in ('**', '__') and part[-2:] == part[:2] and len(part) > 4:
+            run.update(text=part[2:-2], bold=True)
+        elif part[0] == '`' and part[-1] == '`' and len(part) > 2:
+            run.update(text=part[1:-1], code=True)
+        elif part[0] in '*_' and part[-1] == part[0] and len(part) > 2:
+            run.update(text=part[1:-1], italic=True)
+        runs.append(run)
+    return runs
+
+def parse_markdown(content: str) -> List[Dict[str, Any]]:
+    """Parse markdown into a flat list of blocks
+    
+    DOCX documents are built from this tree. Blocks are headings (levels
+    1-3), bullet and numbered list items, horizontal rules and paragraphs.
+    
+    Args:
+        content: Markdown content
+        
+    Returns:
+        List of blocks ({"type", "level", "runs"})
+    """
+    blocks = []
+    for line in content.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        
+        # Handle headings
+        if line.startswith('### '):
+            blocks.append({"type": "heading", "level": 3, "runs": parse_inline(line[4:])})
+        elif line.startswith('## '):
+            blocks.append({"type": "heading", "level": 2, "runs": parse_inline(line[3:])})
+        elif line.startswith('# '):
+            blocks.append({"type": "heading", "level": 1, "runs": parse_inline(line[2:])})
+        # Handle horizontal rules (including front matter delimiters)
+        elif RULE_PATTERN.match(line):
+            blocks.append({"type": "rule", "level": 0, "runs": []})
+        # Handle bullet points
+        elif line.startswith('* ') or line.startswith('- '):
+            blocks.append({"type": "bullet", "level": 0, "runs": parse_inline(line[2:])})
+        # Handle numbered lists
+        elif NUMBERED_PATTERN.match(line):
+            blocks.append({"type": "numbered", "level": 0, "runs": parse_inline(NUMBERED_PATTERN.sub('', line))})
+        # Handle regular paragraphs
+        else:
+            blocks.append({"type": "paragraph", "level": 0, "runs": parse_inline(line)})
+    return blocks
+
+def markdown_to_html(content: str) -> str:
+    """Render markdown as an HTML document (the input to PDF rendering)
+    
+    PDFs go through markdown2 rather than the block tree, so links, tables,
+    code blocks and quotes keep their formatting.
+    
+    Args:
+        content: Markdown content
+        
+    Returns:
+        HTML text
+    """
+    body = markdown2.markdown(content, extras=MARKDOWN_EXTRAS)
+    return f'<html><head><meta charset="utf-8"></head><body>\n{body}</body></html>'
+
+def render_docx(blocks: List[Dict[str, Any]], file_path: str):
+    """Render blocks as a DOCX file
+    
+    Args:
+        blocks: Blocks from parse_markdown
+        file_path: Path to write the document to
+    """
+    doc = DocxDocument()
+    for block in blocks:
+        if block["type"] == "rule":
+            continue
+        if block["type"] == "heading":
+            paragraph = doc.add_heading('', level=block["level"])
+        elif block["type"] == "bullet":
+            paragraph = doc.add_paragraph(style='ListBullet')
+        elif block["type"] == "numbered":
+            paragraph = doc.add_paragraph(style='ListNumber')
+        else:
+            paragraph = doc.add_paragraph()
+        
+        for run in block["runs"]:
+            docx_run = paragraph.add_run(run["text"])
+            docx_run.bold = run["bold"] or None
+            docx_run.italic = run["italic"] or None
+            if run["code"]:
+                docx_run.font.name = 'Courier New'
+    doc.save(file_path)
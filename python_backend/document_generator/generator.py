@@ -1,28 +1,65 @@
 import os
 import sys
+import hashlib
 import logging
-import markdown2
-import pdfkit
-from docx import Document as DocxDocument
-from datetime import datetime
-from typing import Dict, Any, List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import config
-from models import GeneratedDocument, Session
+from models import GeneratedDocument, DocumentBlob, Session, insert_ignore
+from batch_writer import BatchWriter
+from document_generator.document_tree import parse_markdown, render_docx, markdown_to_html
+from document_generator.pdf_backends import get_pdf_backend
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Output formats and their file extensions
+FORMATS = ('markdown', 'pdf', 'docx')
+FILE_EXTENSIONS = {'markdown': 'md', 'pdf': 'pdf', 'docx': 'docx'}
+
+_render_pool = None
+_render_pool_lock = threading.Lock()
+
+def get_render_pool() -> ThreadPoolExecutor:
+    """Get the process-wide pool that renders document formats
+    
+    PDF backends render in wkhtmltopdf processes or release the GIL in
+    I/O, so threads are enough to overlap formats.
+    """
+    global _render_pool
+    if _render_pool is None:
+        with _render_pool_lock:
+            if _render_pool is None:
+                _render_pool = ThreadPoolExecutor(max_workers=config.RENDER_WORKERS, thread_name_prefix='render')
+    return _render_pool
+
+def _reset_after_fork():
+    """A forked child must create its own render threads"""
+    global _render_pool, _render_pool_lock
+    _render_pool = None
+    _render_pool_lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
 class DocumentGenerator:
     """Generate documents in different formats from markdown content"""
     
-    def __init__(self):
-        """Initialize the document generator"""
+    def __init__(self, writer: Optional[BatchWriter] = None):
+        """Initialize the document generator
+        
+        Args:
+            writer: Batch writer to buffer GeneratedDocument rows in (default:
+                save each document in its own transaction)
+        """
         self.output_folder = config.OUTPUT_FOLDER
+        self.writer = writer
         
         # Create output folder if it doesn't exist
         if not os.path.exists(self.output_folder):
@@ -50,6 +87,35 @@ class DocumentGenerator:
         Returns:
             Dictionary with file path and metadata
         """
+        return self.generate_documents(content, student_email, company, role, job_id, formats=[format_type])[0]
+    
+    def generate_documents(
+        self,
+        content: str,
+        student_email: str,
+        company: str,
+        role: str,
+        job_id: int,
+        formats: List[str] = FORMATS
+    ) -> List[Dict[str, Any]]:
+        """Generate a document in several formats
+        
+        The markdown is converted once per format family (HTML for PDF, a
+        block tree for DOCX) and the formats are rendered concurrently in
+        the render pool. The GeneratedDocument
+        rows of all formats are saved in one transaction.
+        
+        Args:
+            content: Markdown content
+            student_email: Email of the student
+            company: Company name
+            role: Job role
+            job_id: ID of the job
+            formats: Format types ('markdown', 'pdf', 'docx')
+            
+        Returns:
+            One dictionary with file path and metadata per format, in order
+        """
         # Sanitize filename components
         student_email = self._sanitize_filename(student_email)
         company = self._sanitize_filename(company)
@@ -58,251 +124,198 @@ class DocumentGenerator:
         # Create base filename
         base_filename = f"{student_email}_{company}_{role}"
         
-        # Generate document based on format type
-        if format_type == 'markdown':
-            return self._generate_markdown(content, base_filename, job_id)
-        elif format_type == 'pdf':
-            return self._generate_pdf(content, base_filename, job_id)
-        elif format_type == 'docx':
-            return self._generate_docx(content, base_filename, job_id)
+        # Convert the markdown once for the formats rendered from it
+        sources = {f: self._prepare(f, content) for f in formats}
+        
+        # Render concurrently (a single format renders in this thread)
+        renders = {}
+        if len(formats) > 1:
+            pool = get_render_pool()
+            futures = [
+                (format_type, pool.submit(self._render, format_type, content, sources[format_type], base_filename))
+                for format_type in formats
+            ]
+            for format_type, future in futures:
+                renders[format_type] = future.result()
         else:
-            logger.error(f"Unsupported format type: {format_type}")
-            return {"error": f"Unsupported format type: {format_type}"}
+            for format_type in formats:
+                renders[format_type] = self._render(format_type, content, sources[format_type], base_filename)
+        
+        # Save every rendered format together
+        rendered = [(f, renders[f]['file_path']) for f in formats if 'error' not in renders[f]]
+        saved = dict(zip([f for f, _ in rendered], self._save_records(content, base_filename, job_id, rendered)))
+        return [saved.get(format_type, renders[format_type]) for format_type in formats]
     
-    def _sanitize_filename(self, filename: str) -> str:
-        """Sanitize filename to remove invalid characters
+    def _prepare(self, format_type: str, content: str) -> Any:
+        """Convert markdown into what a format is rendered from
         
         Args:
-            filename: Filename to sanitize
+            format_type: Format type ('markdown', 'pdf', 'docx')
+            content: Markdown content
             
         Returns:
-            Sanitized filename
+            HTML for 'pdf', blocks for 'docx', None for 'markdown'
         """
-        # Replace invalid characters with underscores
-        invalid_chars = '<>:"/\\|?*'
-        for char in invalid_chars:
-            filename = filename.replace(char, '_')
-        
-        # Limit length
-        return filename[:50]
+        if format_type == 'pdf':
+            return markdown_to_html(content)
+        if format_type == 'docx':
+            return parse_markdown(content)
+        return None
     
-    def _generate_markdown(self, content: str, base_filename: str, job_id: int) -> Dict[str, Any]:
-        """Generate a markdown document
+    def _render(self, format_type: str, content: str, source: Any, base_filename: str) -> Dict[str, Any]:
+        """Render one format to a file in the output folder
         
         Args:
+            format_type: Format type ('markdown', 'pdf', 'docx')
             content: Markdown content
+            source: Converted markdown from _prepare
             base_filename: Base filename
-            job_id: ID of the job
             
         Returns:
-            Dictionary with file path and metadata
+            Dictionary with the file path, or with an error
         """
+        if format_type not in FILE_EXTENSIONS:
+            logger.error(f"Unsupported format type: {format_type}")
+            return {"error": f"Unsupported format type: {format_type}"}
+        
+        file_path = os.path.join(self.output_folder, f"{base_filename}.{FILE_EXTENSIONS[format_type]}")
         try:
-            # Create filename
-            filename = f"{base_filename}.md"
-            file_path = os.path.join(self.output_folder, filename)
-            
-            # Write content to file
+            self._write_format(format_type, content, source, file_path)
+            logger.info(f"Generated {format_type} document: {file_path}")
+            return {"file_path": file_path}
+        except Exception as e:
+            logger.error(f"Error generating {format_type} document: {e}")
+            return {"error": str(e)}
+    
+    def _write_format(self, format_type: str, content: str, source: Any, file_path: str):
+        """Write one format of a document to a file"""
+        if format_type == 'markdown':
             with open(file_path, 'w', encoding='utf-8') as f:
                 f.write(content)
+        elif format_type == 'pdf':
+            get_pdf_backend().render(source, file_path)
+        else:
+            render_docx(source, file_path)
+    
+    def cached_render_path(self, digest: str, format_type: str) -> str:
+        """Path a document is cached at by render_cached, rendered or not
+        
+        Args:
+            digest: SHA-256 of the markdown content (GeneratedDocument.content_hash)
+            format_type: Format type ('markdown', 'pdf', 'docx')
             
-            # Save to database
-            session = Session()
-            try:
-                # Extract email from filename
-                email = base_filename.split('_')[0]
-                
-                # Extract company and role
-                parts = base_filename.split('_')
-                company = parts[1] if len(parts) > 1 else ""
-                role = parts[2] if len(parts) > 2 else ""
-                
-                # Create document record
-                doc = GeneratedDocument(
-                    job_id=job_id,
-                    student_email=email,
-                    company=company,
-                    role=role,
-                    document_type='markdown',
-                    file_path=file_path,
-                    content=content
-                )
-                session.add(doc)
-                session.commit()
-                
-                logger.info(f"Generated markdown document: {file_path}")
-                return {
-                    "file_path": file_path,
-                    "document_type": 'markdown',
-                    "document_id": doc.id
-                }
-            except Exception as e:
-                session.rollback()
-                logger.error(f"Error saving document to database: {e}")
-                return {
-                    "file_path": file_path,
-                    "document_type": 'markdown',
-                    "error": str(e)
-                }
-            finally:
-                session.close()
-        except Exception as e:
-            logger.error(f"Error generating markdown document: {e}")
-            return {"error": str(e)}
+        Returns:
+            Path of the cached file
+        """
+        if format_type not in FILE_EXTENSIONS:
+            raise ValueError(f"Unsupported format type: {format_type}")
+        return os.path.join(config.RENDER_CACHE_FOLDER, f"{digest}.{FILE_EXTENSIONS[format_type]}")
     
-    def _generate_pdf(self, content: str, base_filename: str, job_id: int) -> Dict[str, Any]:
-        """Generate a PDF document
+    def render_cached(self, content: str, format_type: str, digest: str = None) -> str:
+        """Render markdown content to a format on demand, caching the file
+        
+        Files are kept in the render cache folder, named by a hash of the
+        content, so each distinct document is rendered once per format.
         
         Args:
             content: Markdown content
-            base_filename: Base filename
-            job_id: ID of the job
+            format_type: Format type ('markdown', 'pdf', 'docx')
+            digest: SHA-256 of the content, when already known
             
         Returns:
-            Dictionary with file path and metadata
+            Path of the cached file
         """
+        digest = digest or hashlib.sha256(content.encode('utf-8')).hexdigest()
+        file_path = self.cached_render_path(digest, format_type)
+        if os.path.exists(file_path):
+            return file_path
+        
+        # Render to a private file first so concurrent requests never see a partial file
+        tmp_path = os.path.join(config.RENDER_CACHE_FOLDER, f"{digest}.{os.getpid()}.{threading.get_ident()}.tmp.{FILE_EXTENSIONS[format_type]}")
         try:
-            # Convert markdown to HTML
-            html = markdown2.markdown(content)
-            
-            # Create filename
-            filename = f"{base_filename}.pdf"
-            file_path = os.path.join(self.output_folder, filename)
-            
-            # Convert HTML to PDF
-            pdfkit.from_string(html, file_path)
+            self._write_format(format_type, content, self._prepare(format_type, content), tmp_path)
+            os.replace(tmp_path, file_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        logger.info(f"Rendered {format_type} document into cache: {file_path}")
+        return file_path
+    
+    def _sanitize_filename(self, filename: str) -> str:
+        """Sanitize filename to remove invalid characters
+        
+        Args:
+            filename: Filename to sanitize
             
-            # Save to database
-            session = Session()
-            try:
-                # Extract email from filename
-                email = base_filename.split('_')[0]
-                
-                # Extract company and role
-                parts = base_filename.split('_')
-                company = parts[1] if len(parts) > 1 else ""
-                role = parts[2] if len(parts) > 2 else ""
-                
-                # Create document record
-                doc = GeneratedDocument(
-                    job_id=job_id,
-                    student_email=email,
-                    company=company,
-                    role=role,
-                    document_type='pdf',
-                    file_path=file_path,
-                    content=content  # Store original markdown
-                )
-                session.add(doc)
-                session.commit()
-                
-                logger.info(f"Generated PDF document: {file_path}")
-                return {
-                    "file_path": file_path,
-                    "document_type": 'pdf',
-                    "document_id": doc.id
-                }
-            except Exception as e:
-                session.rollback()
-                logger.error(f"Error saving document to database: {e}")
-                return {
-                    "file_path": file_path,
-                    "document_type": 'pdf',
-                    "error": str(e)
-                }
-            finally:
-                session.close()
-        except Exception as e:
-            logger.error(f"Error generating PDF document: {e}")
-            return {"error": str(e)}
+        Returns:
+            Sanitized filename
+        """
+        # Replace invalid characters with underscores
+        invalid_chars = '<>:"/\\|?*'
+        for char in invalid_chars:
+            filename = filename.replace(char, '_')
+        
+        # Limit length
+        return filename[:50]
     
-    def _generate_docx(self, content: str, base_filename: str, job_id: int) -> Dict[str, Any]:
-        """Generate a DOCX document
+    def _save_records(self, content: str, base_filename: str, job_id: int, rendered: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """Save the GeneratedDocument rows of a document's formats, or buffer them in the batch writer
         
         Args:
             content: Markdown content
             base_filename: Base filename
             job_id: ID of the job
+            rendered: (document type, file path) of each rendered format
             
         Returns:
-            Dictionary with file path and metadata
+            One dictionary with file path and metadata per format (no
+            document_id when the rows are buffered)
         """
+        if not rendered:
+            return []
+        
+        # The markdown is stored once, compressed, and referenced by every format
+        blob = DocumentBlob.row(content)
+        
+        # Extract email, company and role from filename
+        parts = base_filename.split('_')
+        rows = [
+            {
+                'job_id': job_id,
+                'student_email': parts[0],
+                'company': parts[1] if len(parts) > 1 else "",
+                'role': parts[2] if len(parts) > 2 else "",
+                'document_type': document_type,
+                'file_path': file_path,
+                'content_hash': blob['hash']  # Original markdown
+            }
+            for document_type, file_path in rendered
+        ]
+        
+        if self.writer is not None:
+            self.writer.add_many(DocumentBlob, [blob])
+            self.writer.add_many(GeneratedDocument, rows)
+            return [
+                {"file_path": file_path, "document_type": document_type, "document_id": None}
+                for document_type, file_path in rendered
+            ]
+        
+        session = Session()
         try:
-            # Create filename
-            filename = f"{base_filename}.docx"
-            file_path = os.path.join(self.output_folder, filename)
-            
-            # Create document
-            doc = DocxDocument()
-            
-            # Parse markdown and add to document
-            # This is a simple implementation - for production, use a more robust markdown to docx converter
-            lines = content.split('\n')
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                
-                # Handle headings
-                if line.startswith('# '):
-                    doc.add_heading(line[2:], level=1)
-                elif line.startswith('## '):
-                    doc.add_heading(line[3:], level=2)
-                elif line.startswith('### '):
-                    doc.add_heading(line[4:], level=3)
-                # Handle bullet points
-                elif line.startswith('* ') or line.startswith('- '):
-                    doc.add_paragraph(line[2:], style='ListBullet')
-                # Handle numbered lists
-                elif line.startswith('1. ') or line.startswith('1) '):
-                    doc.add_paragraph(line[3:], style='ListNumber')
-                # Handle regular paragraphs
-                else:
-                    doc.add_paragraph(line)
-            
-            # Save document
-            doc.save(file_path)
-            
-            # Save to database
-            session = Session()
-            try:
-                # Extract email from filename
-                email = base_filename.split('_')[0]
-                
-                # Extract company and role
-                parts = base_filename.split('_')
-                company = parts[1] if len(parts) > 1 else ""
-                role = parts[2] if len(parts) > 2 else ""
-                
-                # Create document record
-                doc = GeneratedDocument(
-                    job_id=job_id,
-                    student_email=email,
-                    company=company,
-                    role=role,
-                    document_type='docx',
-                    file_path=file_path,
-                    content=content  # Store original markdown
-                )
-                session.add(doc)
-                session.commit()
-                
-                logger.info(f"Generated DOCX document: {file_path}")
-                return {
-                    "file_path": file_path,
-                    "document_type": 'docx',
-                    "document_id": doc.id
-                }
-            except Exception as e:
-                session.rollback()
-                logger.error(f"Error saving document to database: {e}")
-                return {
-                    "file_path": file_path,
-                    "document_type": 'docx',
-                    "error": str(e)
-                }
-            finally:
-                session.close()
+            insert_ignore(session, DocumentBlob, [blob])
+            docs = [GeneratedDocument(**row) for row in rows]
+            session.add_all(docs)
+            session.commit()
+            return [
+                {"file_path": doc.file_path, "document_type": doc.document_type, "document_id": doc.id}
+                for doc in docs
+            ]
         except Exception as e:
-            logger.error(f"Error generating DOCX document: {e}")
-            return {"error": str(e)}
\ No newline at end of file
+            session.rollback()
+            logger.error(f"Error saving documents to database: {e}")
+            return [
+                {"file_path": file_path, "document_type": document_type, "error": str(e)}
+                for document_type, file_path in rendered
+            ]
+        finally:
+            session.close()
@@ -0,0 +1,259 @@
+import os
+import sys
+import time
+import queue
+import shutil
+import logging
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import Future
+from typing import List, Optional, Tuple
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def _move_into_place(source: str, destination: str):
+    """Move a file over destination atomically, even from another filesystem"""
+    staged = f'{destination}.{os.getpid()}-{threading.get_ident()}.part'
+    shutil.move(source, staged)
+    os.replace(staged, destination)
+
+class PDFBackend:
+    """Renders HTML to PDF files"""
+    
+    name = 'base'
+    
+    def render(self, html: str, file_path: str):
+        """Render one HTML document to a PDF file
+        
+        Args:
+            html: HTML document
+            file_path: Path to write the PDF to
+            
+        Raises:
+            RuntimeError: If the PDF could not be rendered
+        """
+        raise NotImplementedError
+    
+    def close(self):
+        """Release renderer processes or threads"""
+        pass
+
+class WkhtmltopdfBackend(PDFBackend):
+    """One wkhtmltopdf process per document, through pdfkit"""
+    
+    name = 'wkhtmltopdf'
+    
+    def __init__(self, binary: str = None):
+        """Initialize the backend
+        
+        Args:
+            binary: wkhtmltopdf executable (default: from config)
+        """
+        self.binary = binary or config.WKHTMLTOPDF_PATH
+        self._configuration = None
+    
+    def render(self, html: str, file_path: str):
+        """Render one HTML document to a PDF file"""
+        import pdfkit
+        if self._configuration is None:
+            self._configuration = pdfkit.configuration(wkhtmltopdf=shutil.which(self.binary) or self.binary)
+        pdfkit.from_string(html, file_path, configuration=self._configuration)
+
+class WkhtmltopdfBatchBackend(PDFBackend):
+    """Pool of renderer threads, each converting documents in batches
+    
+    render() queues the document and waits. Each renderer thread takes up
+    to batch_size queued documents (waiting at most batch_ms for more),
+    writes their HTML to temporary files and converts the whole batch with
+    one wkhtmltopdf process started with --read-args-from-stdin, which
+    reads one conversion per line. Process start-up, which dominates the
+    cost of a small document, is paid once per batch instead of once per
+    document.
+    """
+    
+    name = 'wkhtmltopdf-batch'
+    
+    def __init__(self, workers: int = None, batch_size: int = None, batch_ms: int = None, binary: str = None):
+        """Initialize the backend
+        
+        Args:
+            workers: Renderer threads, i.e. concurrent wkhtmltopdf processes (default: from config)
+            batch_size: Maximum documents per wkhtmltopdf process (default: from config)
+            batch_ms: Milliseconds to wait for a batch to fill (default: from config)
+            binary: wkhtmltopdf executable (default: from config)
+        """
+        self.workers = workers or config.PDF_WORKERS
+        self.batch_size = batch_size or config.PDF_BATCH_SIZE
+        self.batch_seconds = (config.PDF_BATCH_MS if batch_ms is None else batch_ms) / 1000
+        self.binary = binary or config.WKHTMLTOPDF_PATH
+        self._queue = queue.Queue()
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._run, name=f'pdf-renderer-{i}', daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+    
+    def render(self, html: str, file_path: str):
+        """Render one HTML document to a PDF file"""
+        if self._closed:
+            raise RuntimeError("PDF backend is closed")
+        future = Future()
+        self._queue.put((html, file_path, future))
+        future.result()
+    
+    def close(self):
+        """Stop the renderer threads once queued documents are rendered"""
+        self._closed = True
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+    
+    def _next_batch(self) -> Optional[List[Tuple[str, str, Future]]]:
+        """Wait for a document, then collect more until the batch is full or due"""
+        item = self._queue.get()
+        if item is None:
+            return None
+        batch = [item]
+        deadline = time.monotonic() + self.batch_seconds
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Keep the stop signal for the next round
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+    
+    def _run(self):
+        """Renderer thread: convert batches until closed"""
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            try:
+                self._render_batch(batch)
+            except Exception as e:
+                logger.error(f"Error rendering PDF batch: {e}")
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+    
+    def _render_batch(self, batch: List[Tuple[str, str, Future]]):
+        """Convert a batch of documents with one wkhtmltopdf process
+        
+        Input and output files are numbered inside a private temporary
+        directory, so no caller-supplied path reaches the argument lines
+        wkhtmltopdf reads from stdin. Each PDF is moved into place once
+        rendered.
+        """
+        with tempfile.TemporaryDirectory(prefix='pdf-batch-') as tmp:
+            lines = []
+            for i, (html, _, _) in enumerate(batch):
+                with open(os.path.join(tmp, f'{i}.html'), 'w', encoding='utf-8') as f:
+                    f.write(html)
+                lines.append(f'"{tmp}/{i}.html" "{tmp}/{i}.pdf"')
+            
+            result = subprocess.run(
+                [self.binary, '--quiet', '--read-args-from-stdin'],
+                input='\n'.join(lines) + '\n',
+                capture_output=True,
+                text=True,
+                timeout=config.PDF_BATCH_TIMEOUT_SECONDS
+            )
+            
+            for i, (_, file_path, future) in enumerate(batch):
+                pdf_path = os.path.join(tmp, f'{i}.pdf')
+                if os.path.exists(pdf_path) and os.path.getsize(pdf_path) > 0:
+                    try:
+                        _move_into_place(pdf_path, file_path)
+                    except OSError as e:
+                        future.set_exception(e)
+                        continue
+                    future.set_result(file_path)
+                else:
+                    future.set_exception(RuntimeError(
+                        f"wkhtmltopdf did not render {file_path} (exit {result.returncode}): {result.stderr.strip()[-500:]}"
+                    ))
+
+class XHTML2PDFBackend(PDFBackend):
+    """Pure-Python rendering with xhtml2pdf, without external processes
+    
+    Supports less CSS than wkhtmltopdf, which is enough for the generated
+    documents' headings, lists and paragraphs.
+    """
+    
+    name = 'xhtml2pdf'
+    
+    def __init__(self):
+        """Initialize the backend"""
+        try:
+            from xhtml2pdf import pisa
+        except ImportError:
+            logger.error("xhtml2pdf is not installed. Install it with: pip install xhtml2pdf")
+            raise
+        self._pisa = pisa
+    
+    def render(self, html: str, file_path: str):
+        """Render one HTML document to a PDF file"""
+        with open(file_path, 'wb') as f:
+            status = self._pisa.CreatePDF(html, dest=f, encoding='utf-8')
+        if status.err:
+            raise RuntimeError(f"xhtml2pdf failed to render {file_path} ({status.err} errors)")
+
+PDF_BACKENDS = {
+    backend.name: backend
+    for backend in (WkhtmltopdfBackend, WkhtmltopdfBatchBackend, XHTML2PDFBackend)
+}
+
+def build_pdf_backend(name: str = None) -> PDFBackend:
+    """Build a PDF backend by name
+    
+    Args:
+        name: 'wkhtmltopdf', 'wkhtmltopdf-batch' or 'xhtml2pdf' (default: from config)
+        
+    Returns:
+        PDF backend
+    """
+    name = name or config.PDF_BACKEND
+    if name not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF backend '{name}', expected one of {sorted(PDF_BACKENDS)}")
+    if name.startswith('wkhtmltopdf') and not shutil.which(config.WKHTMLTOPDF_PATH):
+        logger.warning(f"wkhtmltopdf executable '{config.WKHTMLTOPDF_PATH}' not found on PATH")
+    logger.info(f"Using PDF backend '{name}'")
+    return PDF_BACKENDS[name]()
+
+_pdf_backend = None
+_pdf_backend_lock = threading.Lock()
+
+def get_pdf_backend() -> PDFBackend:
+    """Get the process-wide PDF backend configured in config.PDF_BACKEND"""
+    global _pdf_backend
+    if _pdf_backend is None:
+        with _pdf_backend_lock:
+            if _pdf_backend is None:
+                _pdf_backend = build_pdf_backend()
+    return _pdf_backend
+
+def _reset_after_fork():
+    """A forked child must start its own renderer threads"""
+    global _pdf_backend, _pdf_backend_lock
+    _pdf_backend = None
+    _pdf_backend_lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,254 @@
+import os
+import json
+import queue
+import select
+import logging
+import threading
+from typing import Dict, Any, List, Optional
+from sqlalchemy import text
+
+import config
+from models import engine
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# PostgreSQL NOTIFY channel and payload limit
+NOTIFY_CHANNEL = 'job_events'
+NOTIFY_MAX_BYTES = 7900
+
+class Subscription:
+    """Events for one channel, delivered to one client"""
+    
+    def __init__(self, bus: 'EventBus', channel: str, max_size: int):
+        self.bus = bus
+        self.channel = channel
+        self.events = queue.Queue(maxsize=max_size)
+    
+    def put(self, event: Dict[str, Any]):
+        """Queue an event, dropping the oldest one if the client is too slow"""
+        while True:
+            try:
+                self.events.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self.events.get_nowait()
+                except queue.Empty:
+                    pass
+    
+    def get(self, timeout: float = None) -> Optional[Dict[str, Any]]:
+        """Wait for the next event
+        
+        Returns:
+            Event dictionary, or None on timeout
+        """
+        try:
+            return self.events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+    
+    def close(self):
+        """Stop receiving events"""
+        self.bus.unsubscribe(self)
+
+class EventBus:
+    """Publish/subscribe for job progress events
+    
+    Subscribers in this process are served by an in-process fan-out. With
+    the 'postgres' backend, events are published with NOTIFY and a single
+    LISTEN connection per process feeds the fan-out, so events published by
+    any worker process reach every subscriber. Each NOTIFY carries a JSON
+    list of events: buffered events (per-student progress) are sent
+    together at most every flush_ms, instead of one transaction each.
+    """
+    
+    def __init__(self, backend: str = None, queue_size: int = None, flush_ms: int = None):
+        """Initialize the bus
+        
+        Args:
+            backend: 'local' or 'postgres' (default: from config)
+            queue_size: Events buffered per subscriber (default: from config)
+            flush_ms: Longest delay of a buffered event (default: from config)
+        """
+        self.backend = backend or config.EVENT_BACKEND
+        self.queue_size = queue_size or config.EVENT_QUEUE_SIZE
+        self.flush_seconds = (config.EVENT_FLUSH_MS if flush_ms is None else flush_ms) / 1000
+        self._subscriptions = {}
+        self._lock = threading.Lock()
+        self._listener = None
+        self._listening = threading.Event()
+        self._pending = []
+        self._flush_timer = None
+        self._flush_lock = threading.Lock()
+        self._counters = {"published": 0, "delivered": 0, "notifies": 0}
+    
+    def subscribe(self, channel: str) -> Subscription:
+        """Subscribe to a channel
+        
+        Args:
+            channel: Channel name, e.g. a job ID
+            
+        Returns:
+            Subscription to read events from (close it when done)
+        """
+        subscription = Subscription(self, channel, self.queue_size)
+        with self._lock:
+            self._subscriptions.setdefault(channel, set()).add(subscription)
+            if self.backend == 'postgres' and self._listener is None:
+                self._listener = threading.Thread(target=self._listen, daemon=True)
+                self._listener.start()
+        
+        # Events sent before LISTEN runs are never delivered, so callers that
+        # read a snapshot next must not do so until the listener is up
+        if self.backend == 'postgres' and not self._listening.wait(config.EVENT_LISTEN_TIMEOUT_SECONDS):
+            logger.warning(f"Job event listener not ready after {config.EVENT_LISTEN_TIMEOUT_SECONDS}s")
+        return subscription
+    
+    def unsubscribe(self, subscription: Subscription):
+        """Remove a subscription"""
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.channel)
+            if subscriptions:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.channel]
+    
+    def publish(self, channel: str, event: str, data: Dict[str, Any], buffered: bool = False):
+        """Publish an event
+        
+        Publishing never raises; a lost progress event only delays the UI.
+        An unbuffered event is sent at once, after any buffered ones, so
+        events keep their order.
+        
+        Args:
+            channel: Channel name
+            event: Event type
+            data: JSON-serializable event data
+            buffered: Send with other buffered events within flush_ms
+        """
+        message = {"channel": channel, "event": event, "data": data}
+        with self._lock:
+            self._counters["published"] += 1
+        if self.backend != 'postgres':
+            self._dispatch(message)
+            return
+        
+        with self._lock:
+            self._pending.append(message)
+            if buffered:
+                if self._flush_timer is None:
+                    self._flush_timer = threading.Timer(self.flush_seconds, self.flush)
+                    self._flush_timer.daemon = True
+                    self._flush_timer.start()
+                return
+        self.flush()
+    
+    def flush(self):
+        """Send buffered events, as few NOTIFY payloads as fit the size limit"""
+        # One flush at a time, so a timer flush cannot overtake a status event
+        with self._flush_lock:
+            with self._lock:
+                messages, self._pending = self._pending, []
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+            if messages:
+                self._notify(messages)
+    
+    def _notify(self, messages: List[Dict[str, Any]]):
+        """Send events with NOTIFY in one transaction"""
+        payloads, batch, size = [], [], 2
+        for message in messages:
+            encoded = json.dumps(message)
+            length = len(encoded.encode('utf-8')) + 1
+            if length + 2 > NOTIFY_MAX_BYTES:
+                logger.warning(f"Dropping oversized '{message['event']}' event for {message['channel']}")
+                continue
+            if batch and size + length > NOTIFY_MAX_BYTES:
+                payloads.append('[' + ','.join(batch) + ']')
+                batch, size = [], 2
+            batch.append(encoded)
+            size += length
+        if batch:
+            payloads.append('[' + ','.join(batch) + ']')
+        
+        try:
+            with engine.begin() as connection:
+                for payload in payloads:
+                    connection.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": NOTIFY_CHANNEL, "payload": payload})
+            with self._lock:
+                self._counters["notifies"] += len(payloads)
+        except Exception as e:
+            logger.error(f"Error publishing events: {e}")
+    
+    def _dispatch(self, message: Dict[str, Any]):
+        """Fan an event out to this process's subscribers"""
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(message["channel"], ()))
+            self._counters["delivered"] += len(subscriptions)
+        for subscription in subscriptions:
+            subscription.put(message)
+    
+    def _listen(self):
+        """LISTEN for events from every process, reconnecting on errors"""
+        import psycopg2
+        import psycopg2.extensions
+        
+        backoff = 1
+        while True:
+            connection = None
+            try:
+                connection = psycopg2.connect(config.DB_URL)
+                connection.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                connection.cursor().execute(f"LISTEN {NOTIFY_CHANNEL}")
+                self._listening.set()
+                logger.info(f"Listening for job events in process {os.getpid()}")
+                backoff = 1
+                while True:
+                    if select.select([connection], [], [], config.EVENT_KEEPALIVE_SECONDS) == ([], [], []):
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        notify = connection.notifies.pop(0)
+                        for message in json.loads(notify.payload):
+                            self._dispatch(message)
+            except Exception as e:
+                self._listening.clear()
+                logger.error(f"Job event listener error, reconnecting in {backoff}s: {e}")
+                if connection is not None:
+                    connection.close()
+                threading.Event().wait(backoff)
+                backoff = min(backoff * 2, 30)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get subscriber and event counts"""
+        with self._lock:
+            return dict(
+                self._counters,
+                backend=self.backend,
+                channels=len(self._subscriptions),
+                subscribers=sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+            )
+
+_event_bus = None
+_event_bus_lock = threading.Lock()
+
+def get_event_bus() -> EventBus:
+    """Get the process-wide event bus"""
+    global _event_bus
+    if _event_bus is None:
+        with _event_bus_lock:
+            if _event_bus is None:
+                _event_bus = EventBus()
+    return _event_bus
+
+def _reset_after_fork():
+    """A forked child needs its own listener connection and subscribers"""
+    global _event_bus, _event_bus_lock
+    _event_bus = None
+    _event_bus_lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
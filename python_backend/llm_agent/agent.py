@@ -3,13 +3,14 @@ import sys
 import logging
 import json
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import config
 from llm_agent.ollama_client import OllamaClient
+from llm_agent.retrieval_cache import RetrievalCache
 from vector_db.vector_store import VectorStore
 from models import Document, DocumentChunk, Session, Job, JobResult
 
@@ -17,19 +18,41 @@ from models import Document, DocumentChunk, Session, Job, JobResult
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Metadata added at ingest; it changes with every upload, so it is kept out
+# of prompts (and therefore out of the response cache key)
+INGEST_METADATA_KEYS = ('document_id', 'document_type', 'row_index')
+
+def student_profile(student_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Student data without ingest bookkeeping, as shown to the LLM"""
+    return {key: value for key, value in student_data.items() if key not in INGEST_METADATA_KEYS}
+
 class LLMAgent:
     """LLM Agent for generating personalized documents"""
     
-    def __init__(self):
-        """Initialize the LLM agent"""
-        self.llm = OllamaClient()
-        self.vector_store = VectorStore()
+    def __init__(self, vector_store: VectorStore = None, llm: OllamaClient = None):
+        """Initialize the LLM agent
+        
+        Args:
+            vector_store: Vector store to share (default: create a new one)
+            llm: Ollama client to share (default: create a new one)
+        """
+        self.llm = llm or OllamaClient()
+        self.vector_store = vector_store or VectorStore()
+        
+        # Student records keyed by (student data document ID, email)
+        self.student_records = RetrievalCache()
+        
+        # Job description context keyed by (job description document ID, company, role, k)
+        self.job_descriptions = RetrievalCache()
     
     def generate_personalized_document(
         self, 
         student_email: str, 
         company: str, 
-        role: str
+        role: str,
+        force_regenerate: bool = False,
+        student_document_id: int = None,
+        job_description_document_id: int = None
     ) -> str:
         """Generate a personalized document for a student
         
@@ -37,61 +60,149 @@ class LLMAgent:
             student_email: Email of the student
             company: Company name
             role: Job role
+            force_regenerate: Bypass the LLM response cache
+            student_document_id: ID of the job's student data document (enables the record cache)
+            job_description_document_id: ID of the job's job description document (enables the context cache)
             
         Returns:
             Generated document text in markdown format
         """
         # Get student data from vector store
-        student_data = self._get_student_data(student_email)
+        student_data = self._get_student_data(student_email, student_document_id)
         if not student_data:
             logger.error(f"No student data found for email: {student_email}")
             return f"Error: No student data found for email: {student_email}"
         
         # Get job description from vector store
-        job_description = self._get_job_description(company, role)
+        job_description = self._get_job_description(company, role, job_description_document_id)
         if not job_description:
             logger.error(f"No job description found for company: {company}, role: {role}")
             return f"Error: No job description found for company: {company}, role: {role}"
         
         # Generate document
-        return self._generate_document(student_data, job_description)
+        return self._generate_document(student_data, job_description, force_regenerate)
     
-    def _get_student_data(self, email: str) -> Dict[str, Any]:
+    def stream_personalized_document(
+        self, 
+        student_email: str, 
+        company: str, 
+        role: str,
+        student_document_id: int = None,
+        job_description_document_id: int = None
+    ) -> Iterator[str]:
+        """Generate a personalized document for a student, streaming tokens
+        
+        Args:
+            student_email: Email of the student
+            company: Company name
+            role: Job role
+            student_document_id: ID of the job's student data document (enables the record cache)
+            job_description_document_id: ID of the job's job description document (enables the context cache)
+            
+        Yields:
+            Document text fragments in markdown format, header first
+        """
+        # Get student data from vector store
+        student_data = self._get_student_data(student_email, student_document_id)
+        if not student_data:
+            logger.error(f"No student data found for email: {student_email}")
+            yield f"Error: No student data found for email: {student_email}"
+            return
+        
+        # Get job description from vector store
+        job_description = self._get_job_description(company, role, job_description_document_id)
+        if not job_description:
+            logger.error(f"No job description found for company: {company}, role: {role}")
+            yield f"Error: No job description found for company: {company}, role: {role}"
+            return
+        
+        system_prompt, prompt = self._build_document_prompts(student_data, job_description)
+        yield self._build_document_header(student_data)
+        yield from self.llm.generate_stream(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            max_tokens=config.MAX_TOKENS
+        )
+    
+    def _get_student_data(self, email: str, document_id: int = None) -> Dict[str, Any]:
         """Get student data from vector store
         
+        Student records are fetched by exact metadata match, so no query is
+        embedded. Records of a known student data document are cached.
+        
         Args:
             email: Email of the student
+            document_id: ID of the student data document (default: any)
             
         Returns:
             Student data dictionary
         """
-        # Search vector store for student data
-        results = self.vector_store.search(
-            query=f"email: {email}",
-            k=1,
-            filter={"document_type": "student_data", "email": email}
-        )
+        where = {"document_type": "student_data", "email": email}
+        if document_id is None:
+            return self._fetch_student_data(where)
+        
+        where["document_id"] = document_id
+        return self.student_records.get_or_load((document_id, email), lambda: self._fetch_student_data(where))
+    
+    def _fetch_student_data(self, where: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch one student record from the vector store"""
+        results = self.vector_store.get(where=where, limit=1)
         
         if not results:
             return {}
         
         return results[0]['metadata']
     
-    def _get_job_description(self, company: str, role: str) -> str:
+    def forget_document(self, document_id: int):
+        """Drop cached records of a document that was re-ingested
+        
+        Args:
+            document_id: ID of the document
+        """
+        self.student_records.invalidate(document_id)
+        self.job_descriptions.invalidate(document_id)
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Get retrieval cache statistics"""
+        return {
+            "student_records": self.student_records.stats(),
+            "job_descriptions": self.job_descriptions.stats()
+        }
+    
+    def _get_job_description(self, company: str, role: str, document_id: int = None, k: int = 5) -> str:
         """Get job description from vector store
         
+        The context is the same for every student of a job, so results for a
+        known job description document are cached and the search runs once.
+        
         Args:
             company: Company name
             role: Job role
+            document_id: ID of the job description document (default: any)
+            k: Number of chunks to combine
             
         Returns:
             Job description text
         """
+        if document_id is None:
+            return self._search_job_description(company, role, None, k)
+        
+        return self.job_descriptions.get_or_load(
+            (document_id, company, role, k),
+            lambda: self._search_job_description(company, role, document_id, k)
+        )
+    
+    def _search_job_description(self, company: str, role: str, document_id: Optional[int], k: int) -> str:
+        """Search the vector store for job description chunks"""
+        filter = {"document_type": "job_description", "company": company, "role": role}
+        if document_id is not None:
+            filter["document_id"] = document_id
+        
         # Search vector store for job description
         results = self.vector_store.search(
             query=f"company: {company} role: {role}",
-            k=5,
-            filter={"document_type": "job_description", "company": company, "role": role}
+            k=k,
+            filter=filter
         )
         
         if not results:
@@ -100,19 +211,50 @@ class LLMAgent:
         # Combine chunks
         return "\n\n".join([result['text'] for result in results])
     
-    def _generate_document(self, student_data: Dict[str, Any], job_description: str) -> str:
+    def _generate_document(
+        self,
+        student_data: Dict[str, Any],
+        job_description: str,
+        force_regenerate: bool = False
+    ) -> str:
         """Generate a document using the LLM
         
         Args:
             student_data: Student data dictionary
             job_description: Job description text
+            force_regenerate: Bypass the LLM response cache
             
         Returns:
             Generated document text in markdown format
         """
+        system_prompt, prompt = self._build_document_prompts(student_data, job_description)
+        
+        # Generate document
+        try:
+            generated_text = self.llm.generate(
+                prompt=prompt,
+                system_prompt=system_prompt,
+                max_tokens=config.MAX_TOKENS,
+                bypass_cache=force_regenerate
+            )
+            
+            return self._build_document_header(student_data) + generated_text
+        except Exception as e:
+            logger.error(f"Error generating document: {e}")
+            return f"Error generating document: {str(e)}"
+    
+    def _build_document_prompts(self, student_data: Dict[str, Any], job_description: str) -> Tuple[str, str]:
+        """Build the system prompt and prompt for a personalized document
+        
+        Args:
+            student_data: Student data dictionary
+            job_description: Job description text
+            
+        Returns:
+            Tuple of (system prompt, prompt)
+        """
         # Extract student information
         student_name = student_data.get('name', student_data.get('Name', student_data.get('full name of the student', 'Student')))
-        student_email = student_data.get('email', student_data.get('Email', ''))
         
         # Create prompt
         system_prompt = """You are an expert career counselor and document creator. 
@@ -123,7 +265,7 @@ Format your response in Markdown with appropriate headings, bullet points, and s
         
         prompt = f"""
 # Student Information
-{student_data}
+{student_profile(student_data)}
 
 # Job Description
 {job_description}
@@ -139,16 +281,15 @@ The document should include:
 Format the document in Markdown with clear sections and professional language.
 """
         
-        # Generate document
-        try:
-            generated_text = self.llm.generate(
-                prompt=prompt,
-                system_prompt=system_prompt,
-                max_tokens=config.MAX_TOKENS
-            )
-            
-            # Add header with metadata
-            header = f"""---
+        return system_prompt, prompt
+    
+    def _build_document_header(self, student_data: Dict[str, Any]) -> str:
+        """Build the metadata header prepended to a generated document"""
+        student_name = student_data.get('name', student_data.get('Name', student_data.get('full name of the student', 'Student')))
+        student_email = student_data.get('email', student_data.get('Email', ''))
+        
+        # Add header with metadata
+        header = f"""---
 student_name: {student_name}
 student_email: {student_email}
 company: {student_data.get('company', '')}
@@ -157,17 +298,20 @@ generated_date: {datetime.now().strftime('%Y-%m-%d')}
 ---
 
 """
-            return header + generated_text
-        except Exception as e:
-            logger.error(f"Error generating document: {e}")
-            return f"Error generating document: {str(e)}"
+        return header
     
-    def analyze_match(self, student_data: Dict[str, Any], job_description: str) -> Dict[str, Any]:
+    def analyze_match(
+        self,
+        student_data: Dict[str, Any],
+        job_description: str,
+        force_regenerate: bool = False
+    ) -> Dict[str, Any]:
         """Analyze the match between student and job
         
         Args:
             student_data: Student data dictionary
             job_description: Job description text
+            force_regenerate: Bypass the LLM response cache
             
         Returns:
             Analysis results
@@ -181,7 +325,7 @@ Format your response as JSON.
         
         prompt = f"""
 # Student Information
-{student_data}
+{student_profile(student_data)}
 
 # Job Description
 {job_description}
@@ -206,7 +350,8 @@ Format your response as JSON with the following structure:
             generated_text = self.llm.generate(
                 prompt=prompt,
                 system_prompt=system_prompt,
-                max_tokens=1024
+                max_tokens=1024,
+                bypass_cache=force_regenerate
             )
             
             # Parse JSON
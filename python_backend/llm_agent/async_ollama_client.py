@@ -0,0 +1,130 @@
+import os
+import sys
+import asyncio
+import logging
+import httpx
+from typing import List
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from llm_agent.ollama_client import build_generate_payload, RETRY_STATUS_CODES
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class AsyncOllamaClient:
+    """Asyncio client for the Ollama API, mirroring OllamaClient
+    
+    Usage:
+        async with AsyncOllamaClient() as client:
+            texts = await asyncio.gather(*(client.generate(p) for p in prompts))
+    """
+    
+    def __init__(self, model: str = None, pool_size: int = None):
+        """Initialize the async Ollama client
+        
+        Args:
+            model: Name of the model to use (default: from config)
+            pool_size: Maximum open connections (default: from config)
+        """
+        self.base_url = config.OLLAMA_URL.replace('/api/generate', '')
+        self.model = model or config.OLLAMA_MODEL
+        self.alternative_model = config.OLLAMA_ALTERNATIVE_MODEL
+        pool_size = pool_size or config.OLLAMA_POOL_SIZE
+        # Transport retries only cover failed connects, so a generation that
+        # times out while reading is never sent twice
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            timeout=httpx.Timeout(config.OLLAMA_READ_TIMEOUT, connect=config.OLLAMA_CONNECT_TIMEOUT),
+            transport=httpx.AsyncHTTPTransport(retries=config.OLLAMA_MAX_RETRIES)
+        )
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+    
+    async def aclose(self):
+        """Close pooled connections"""
+        await self.client.aclose()
+    
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send a request, retrying retryable statuses with exponential backoff"""
+        for attempt in range(config.OLLAMA_MAX_RETRIES + 1):
+            response = await self.client.request(method, path, **kwargs)
+            if response.status_code not in RETRY_STATUS_CODES or attempt == config.OLLAMA_MAX_RETRIES:
+                break
+            await asyncio.sleep(config.OLLAMA_RETRY_BACKOFF * (2 ** attempt))
+        response.raise_for_status()
+        return response
+    
+    async def generate(self, prompt: str, system_prompt: str = None, max_tokens: int = 2048) -> str:
+        """Generate text using Ollama
+        
+        Args:
+            prompt: The prompt to generate text from
+            system_prompt: Optional system prompt
+            max_tokens: Maximum number of tokens to generate
+            
+        Returns:
+            Generated text
+        """
+        try:
+            return await self._generate(self.model, prompt, system_prompt, max_tokens)
+        except httpx.HTTPError as e:
+            logger.error(f"Error calling Ollama API with model {self.model}: {e}")
+            
+            # Try alternative model if primary fails
+            if self.model != self.alternative_model:
+                logger.info(f"Trying alternative model: {self.alternative_model}")
+                try:
+                    return await self._generate(self.alternative_model, prompt, system_prompt, max_tokens)
+                except Exception as e2:
+                    logger.error(f"Error with alternative model: {e2}")
+            
+            return f"Error generating text: {str(e)}"
+    
+    async def _generate(self, model: str, prompt: str, system_prompt: str, max_tokens: int) -> str:
+        """Call /api/generate with a specific model"""
+        payload = build_generate_payload(model, prompt, system_prompt, max_tokens)
+        response = await self._request('POST', '/api/generate', json=payload)
+        return response.json().get('response', '')
+    
+    async def get_embedding(self, text: str) -> List[float]:
+        """Get embedding for text using Ollama
+        
+        Args:
+            text: Text to embed
+            
+        Returns:
+            List of embedding values
+        """
+        payload = {
+            "model": config.EMBEDDING_MODEL,
+            "prompt": text
+        }
+        
+        try:
+            response = await self._request('POST', '/api/embeddings', json=payload)
+            return response.json().get('embedding', [])
+        except httpx.HTTPError as e:
+            logger.error(f"Error getting embedding: {e}")
+            return []
+    
+    async def list_models(self) -> List[str]:
+        """List available models
+        
+        Returns:
+            List of model names
+        """
+        try:
+            response = await self._request('GET', '/api/tags', timeout=config.OLLAMA_CONNECT_TIMEOUT)
+            return [model['name'] for model in response.json().get('models', [])]
+        except httpx.HTTPError as e:
+            logger.error(f"Error listing models: {e}")
+            return []
@@ -0,0 +1,76 @@
+import os
+import sys
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class GenerationPool:
+    """Bounded thread pool for concurrent LLM generation
+    
+    At most max_in_flight tasks are submitted at any time; the input iterable
+    is only consumed as tasks complete, so a slow LLM applies backpressure
+    instead of queueing the whole cohort in memory.
+    """
+    
+    def __init__(self, max_workers: int = None, max_in_flight: int = None):
+        """Initialize the pool
+        
+        Args:
+            max_workers: Number of worker threads (default: from config)
+            max_in_flight: Maximum submitted but unfinished tasks (default: from config)
+        """
+        self.max_workers = max_workers or config.GENERATION_WORKERS
+        self.max_in_flight = max(max_in_flight or config.GENERATION_MAX_IN_FLIGHT, self.max_workers)
+    
+    def imap_unordered(
+        self,
+        fn: Callable[[Any], Any],
+        items: Iterable[Any]
+    ) -> Iterator[Tuple[Any, Any, Optional[Exception]]]:
+        """Run fn over items, yielding results as they complete
+        
+        A failing item never stops the others; its exception is yielded
+        instead of a result.
+        
+        Args:
+            fn: Function to run for each item
+            items: Items to process
+            
+        Yields:
+            Tuples of (item, result, error)
+        """
+        items = iter(items)
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='generation') as executor:
+            in_flight = {}
+            exhausted = False
+            while True:
+                # Top up the in-flight window
+                while not exhausted and len(in_flight) < self.max_in_flight:
+                    try:
+                        item = next(items)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    in_flight[executor.submit(fn, item)] = item
+                
+                if not in_flight:
+                    return
+                
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = in_flight.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        logger.error(f"Generation task failed: {error}")
+                        yield item, None, error
+                    else:
+                        yield item, future.result(), None
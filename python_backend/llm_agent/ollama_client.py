@@ -1,83 +1,234 @@
 import os
 import sys
 import logging
+import threading
 import requests
 import json
-from typing import Dict, Any, List, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Any, Iterator, List, Optional
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import config
+from llm_agent.response_cache import get_response_cache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Status codes worth retrying (Ollama returns 503 while a model is loading)
+RETRY_STATUS_CODES = [429, 502, 503, 504]
+
+class OllamaRetry(Retry):
+    """Retry policy that never re-sends a POST after a read error
+    
+    A read timeout on POST /api/generate means Ollama accepted the request
+    and may still be generating; sending it again would queue another
+    expensive generation and multiply the wait. POSTs are still retried on
+    connection errors and retryable status codes, and GETs on read errors.
+    """
+    
+    def increment(self, method=None, url=None, *args, error=None, **kwargs):
+        if method and method.upper() == 'POST' and error is not None and self._is_read_error(error):
+            raise error
+        return super().increment(method, url, *args, error=error, **kwargs)
+
+_shared_session = None
+_shared_session_lock = threading.Lock()
+
+def build_session(pool_size: int = None, max_retries: int = None, backoff: float = None) -> requests.Session:
+    """Build a keep-alive HTTP session with a connection pool and retries
+    
+    Args:
+        pool_size: Maximum pooled connections per host (default: from config)
+        max_retries: Maximum retries per request (default: from config)
+        backoff: Exponential backoff factor in seconds (default: from config)
+        
+    Returns:
+        Configured requests session
+    """
+    pool_size = pool_size or config.OLLAMA_POOL_SIZE
+    retry = OllamaRetry(
+        total=config.OLLAMA_MAX_RETRIES if max_retries is None else max_retries,
+        backoff_factor=config.OLLAMA_RETRY_BACKOFF if backoff is None else backoff,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=['GET', 'POST'],
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry, pool_block=True)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def get_shared_session() -> requests.Session:
+    """Get the process-wide pooled session"""
+    global _shared_session
+    if _shared_session is None:
+        with _shared_session_lock:
+            if _shared_session is None:
+                _shared_session = build_session()
+    return _shared_session
+
+def build_generate_payload(
+    model: str,
+    prompt: str,
+    system_prompt: str = None,
+    max_tokens: int = 2048,
+    stream: bool = False
+) -> Dict[str, Any]:
+    """Build the request body for /api/generate"""
+    payload = {
+        "model": model,
+        "prompt": prompt,
+        "stream": stream,
+        "options": {
+            "num_predict": max_tokens,
+            "temperature": 0.7,
+            "top_p": 0.9,
+            "top_k": 40
+        }
+    }
+    
+    if system_prompt:
+        payload["system"] = system_prompt
+    
+    return payload
+
 class OllamaClient:
     """Client for interacting with Ollama API"""
     
-    def __init__(self, model: str = None):
+    def __init__(self, model: str = None, session: requests.Session = None):
         """Initialize the Ollama client
         
         Args:
             model: Name of the model to use (default: from config)
+            session: HTTP session to use (default: the shared pooled session)
         """
         self.base_url = config.OLLAMA_URL.replace('/api/generate', '')
         self.model = model or config.OLLAMA_MODEL
         self.alternative_model = config.OLLAMA_ALTERNATIVE_MODEL
+        self.session = session or get_shared_session()
+        self.timeout = (config.OLLAMA_CONNECT_TIMEOUT, config.OLLAMA_READ_TIMEOUT)
     
-    def generate(self, prompt: str, system_prompt: str = None, max_tokens: int = 2048) -> str:
+    def generate(
+        self,
+        prompt: str,
+        system_prompt: str = None,
+        max_tokens: int = 2048,
+        bypass_cache: bool = False
+    ) -> str:
         """Generate text using Ollama
         
         Args:
             prompt: The prompt to generate text from
             system_prompt: Optional system prompt
             max_tokens: Maximum number of tokens to generate
+            bypass_cache: Skip the response cache lookup and regenerate
             
         Returns:
             Generated text
         """
-        url = f"{self.base_url}/api/generate"
-        
-        payload = {
-            "model": self.model,
-            "prompt": prompt,
-            "stream": False,
-            "options": {
-                "num_predict": max_tokens,
-                "temperature": 0.7,
-                "top_p": 0.9,
-                "top_k": 40
-            }
-        }
-        
-        if system_prompt:
-            payload["system"] = system_prompt
-        
         try:
-            response = requests.post(url, json=payload)
-            response.raise_for_status()
-            result = response.json()
-            return result.get('response', '')
+            return self._cached_generate(self.model, prompt, system_prompt, max_tokens, bypass_cache)
         except requests.exceptions.RequestException as e:
             logger.error(f"Error calling Ollama API with model {self.model}: {e}")
             
             # Try alternative model if primary fails
             if self.model != self.alternative_model:
                 logger.info(f"Trying alternative model: {self.alternative_model}")
-                backup_model = self.model
-                self.model = self.alternative_model
                 try:
-                    result = self.generate(prompt, system_prompt, max_tokens)
-                    self.model = backup_model  # Restore original model
-                    return result
+                    return self._cached_generate(self.alternative_model, prompt, system_prompt, max_tokens, bypass_cache)
                 except Exception as e2:
                     logger.error(f"Error with alternative model: {e2}")
-                    self.model = backup_model  # Restore original model
             
             return f"Error generating text: {str(e)}"
     
+    def _cached_generate(
+        self,
+        model: str,
+        prompt: str,
+        system_prompt: str,
+        max_tokens: int,
+        bypass_cache: bool
+    ) -> str:
+        """Generate with a specific model through the response cache"""
+        cache = get_response_cache()
+        if cache is None:
+            return self._generate(model, prompt, system_prompt, max_tokens)
+        
+        options = build_generate_payload(model, prompt, system_prompt, max_tokens)["options"]
+        key = cache.make_key(model, system_prompt, prompt, options)
+        if not bypass_cache:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+        
+        # _generate raises on errors, so only successful responses are cached
+        response = self._generate(model, prompt, system_prompt, max_tokens)
+        cache.set(key, response, model=model)
+        return response
+    
+    def generate_stream(self, prompt: str, system_prompt: str = None, max_tokens: int = 2048) -> Iterator[str]:
+        """Generate text using Ollama, yielding tokens as they are produced
+        
+        Args:
+            prompt: The prompt to generate text from
+            system_prompt: Optional system prompt
+            max_tokens: Maximum number of tokens to generate
+            
+        Yields:
+            Generated text fragments
+        """
+        models = [self.model]
+        if self.model != self.alternative_model:
+            models.append(self.alternative_model)
+        
+        for model in models:
+            started = False
+            try:
+                for token in self._generate_stream(model, prompt, system_prompt, max_tokens):
+                    started = True
+                    yield token
+                return
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Error streaming from Ollama API with model {model}: {e}")
+                # Only fall back if nothing has been sent yet
+                if started:
+                    raise
+        
+        raise requests.exceptions.ConnectionError("All Ollama models failed to stream")
+    
+    def _generate_stream(self, model: str, prompt: str, system_prompt: str, max_tokens: int) -> Iterator[str]:
+        """Call /api/generate in streaming mode with a specific model"""
+        url = f"{self.base_url}/api/generate"
+        payload = build_generate_payload(model, prompt, system_prompt, max_tokens, stream=True)
+        
+        with self.session.post(url, json=payload, timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if chunk.get('error'):
+                    raise requests.exceptions.RequestException(chunk['error'])
+                if chunk.get('response'):
+                    yield chunk['response']
+                if chunk.get('done'):
+                    break
+    
+    def _generate(self, model: str, prompt: str, system_prompt: str, max_tokens: int) -> str:
+        """Call /api/generate with a specific model"""
+        url = f"{self.base_url}/api/generate"
+        payload = build_generate_payload(model, prompt, system_prompt, max_tokens)
+        
+        response = self.session.post(url, json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        result = response.json()
+        return result.get('response', '')
+    
     def get_embedding(self, text: str) -> List[float]:
         """Get embedding for text using Ollama
         
@@ -90,12 +241,12 @@ class OllamaClient:
         url = f"{self.base_url}/api/embeddings"
         
         payload = {
-            "model": "nomic-embed-text",
+            "model": config.EMBEDDING_MODEL,
             "prompt": text
         }
         
         try:
-            response = requests.post(url, json=payload)
+            response = self.session.post(url, json=payload, timeout=self.timeout)
             response.raise_for_status()
             result = response.json()
             return result.get('embedding', [])
@@ -112,11 +263,11 @@ class OllamaClient:
         url = f"{self.base_url}/api/tags"
         
         try:
-            response = requests.get(url)
+            response = self.session.get(url, timeout=(config.OLLAMA_CONNECT_TIMEOUT, config.OLLAMA_CONNECT_TIMEOUT))
             response.raise_for_status()
             result = response.json()
             models = [model['name'] for model in result.get('models', [])]
             return models
         except requests.exceptions.RequestException as e:
             logger.error(f"Error listing models: {e}")
-            return []
\ No newline at end of file
+            return []
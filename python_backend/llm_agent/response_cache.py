@@ -0,0 +1,226 @@
+import os
+import sys
+import time
+import json
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Share of max_entries evicted once the cache is full, so the table is
+# counted and trimmed once per that many writes instead of on every write
+EVICTION_FRACTION = 0.1
+
+class ResponseCache:
+    """Content-addressed cache of LLM responses
+    
+    Responses are keyed by a hash of model, system prompt, prompt and
+    generation options. Lookups go through an in-memory LRU first and then
+    a local SQLite database, so cached responses survive restarts.
+    """
+    
+    def __init__(
+        self,
+        path: str = None,
+        max_entries: int = None,
+        ttl_seconds: int = None,
+        memory_entries: int = None
+    ):
+        """Initialize the cache
+        
+        Args:
+            path: Path to the SQLite database (default: from config)
+            max_entries: Maximum entries kept on disk (default: from config)
+            ttl_seconds: Entry lifetime in seconds, 0 to disable (default: from config)
+            memory_entries: Maximum entries kept in memory (default: from config)
+        """
+        self.path = path or config.LLM_CACHE_PATH
+        self.max_entries = max_entries or config.LLM_CACHE_MAX_ENTRIES
+        self.ttl_seconds = config.LLM_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.memory_entries = memory_entries or config.LLM_CACHE_MEMORY_ENTRIES
+        
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        
+        self._connection().execute("""
+            CREATE TABLE IF NOT EXISTS llm_responses (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                model TEXT,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._connection().execute("CREATE INDEX IF NOT EXISTS idx_llm_responses_last_used ON llm_responses (last_used)")
+        self._connection().commit()
+        
+        # Running estimate of the rows on disk. Replaced keys and writes from
+        # other processes make it drift; it is corrected whenever it says the
+        # cache is full, by counting the table before evicting.
+        self._disk_count = self._connection().execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's SQLite connection"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+    
+    @staticmethod
+    def make_key(model: str, system_prompt: Optional[str], prompt: str, options: Dict[str, Any]) -> str:
+        """Hash a request into a cache key
+        
+        Args:
+            model: Model name
+            system_prompt: System prompt
+            prompt: Prompt
+            options: Generation options
+            
+        Returns:
+            Hex digest identifying the request
+        """
+        request = json.dumps(
+            {"model": model, "system": system_prompt or "", "prompt": prompt, "options": options},
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha256(request.encode('utf-8')).hexdigest()
+    
+    def _expired(self, created_at: float) -> bool:
+        """Check if an entry created at created_at has outlived the TTL"""
+        return bool(self.ttl_seconds) and time.time() - created_at > self.ttl_seconds
+    
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached response
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Cached response, or None on a miss
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._expired(entry[1]):
+                    self._memory.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    return entry[0]
+                del self._memory[key]
+        
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT response, created_at FROM llm_responses WHERE key = ?", (key,)
+        ).fetchone()
+        
+        if row is None or self._expired(row[1]):
+            if row is not None:
+                connection.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                connection.commit()
+            with self._lock:
+                self._counters["misses"] += 1
+                if row is not None:
+                    self._disk_count -= 1
+            return None
+        
+        connection.execute("UPDATE llm_responses SET last_used = ? WHERE key = ?", (time.time(), key))
+        connection.commit()
+        with self._lock:
+            self._remember(key, row[0], row[1])
+            self._counters["disk_hits"] += 1
+        return row[0]
+    
+    def set(self, key: str, response: str, model: str = None):
+        """Store a response
+        
+        Args:
+            key: Cache key
+            response: Response text
+            model: Model that produced the response
+        """
+        now = time.time()
+        connection = self._connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO llm_responses (key, response, model, created_at, last_used) VALUES (?, ?, ?, ?, ?)",
+            (key, response, model, now, now)
+        )
+        
+        with self._lock:
+            self._disk_count += 1
+            full = self._disk_count > self.max_entries
+        
+        # Once full, evict least recently used entries down to below the size limit
+        evicted = 0
+        if full:
+            count = connection.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+            if count > self.max_entries:
+                target = self.max_entries - max(1, int(self.max_entries * EVICTION_FRACTION))
+                evicted = connection.execute(
+                    "DELETE FROM llm_responses WHERE key IN "
+                    "(SELECT key FROM llm_responses ORDER BY last_used ASC LIMIT ?)",
+                    (count - target,)
+                ).rowcount
+            with self._lock:
+                self._disk_count = count - evicted
+        connection.commit()
+        
+        with self._lock:
+            self._remember(key, response, now)
+            self._counters["writes"] += 1
+            self._counters["evictions"] += evicted
+    
+    def _remember(self, key: str, response: str, created_at: float):
+        """Put an entry in the in-memory LRU (caller holds the lock)"""
+        self._memory[key] = (response, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+    
+    def clear(self):
+        """Remove every cached response"""
+        connection = self._connection()
+        connection.execute("DELETE FROM llm_responses")
+        connection.commit()
+        with self._lock:
+            self._memory.clear()
+            self._disk_count = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats["memory_size"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        stats["disk_size"] = self._connection().execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+        return stats
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Get the process-wide response cache, or None if caching is disabled"""
+    global _response_cache
+    if not config.LLM_CACHE_ENABLED:
+        return None
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache()
+    return _response_cache
@@ -0,0 +1,117 @@
+import os
+import sys
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Hashable, Optional
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class RetrievalCache:
+    """Thread-safe in-memory LRU cache for records retrieved from the vector store
+    
+    Keys are tuples whose first element is the ID of the source document, so
+    every entry of a document can be dropped when it is re-ingested.
+    """
+    
+    def __init__(self, max_entries: int = None):
+        """Initialize the cache
+        
+        Args:
+            max_entries: Entries kept before the least recently used is evicted (default: from config)
+        """
+        self.max_entries = config.RETRIEVAL_CACHE_SIZE if max_entries is None else max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a cached value
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Cached value, or None on a miss
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def put(self, key: Hashable, value: Any):
+        """Cache a value (empty results are not cached)
+        
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        if not value or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def get_or_load(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        """Get a cached value, loading and caching it on a miss
+        
+        Args:
+            key: Cache key
+            load: Called without the lock held to fetch the value
+            
+        Returns:
+            Cached or loaded value
+        """
+        value = self.get(key)
+        if value is None:
+            value = load()
+            self.put(key, value)
+        return value
+    
+    def invalidate(self, document_id: int) -> int:
+        """Drop every entry of a source document
+        
+        Args:
+            document_id: ID of the document
+            
+        Returns:
+            Number of entries dropped
+        """
+        with self._lock:
+            keys = [key for key in self._entries if key[0] == document_id]
+            for key in keys:
+                del self._entries[key]
+        if keys:
+            logger.info(f"Dropped {len(keys)} cached records of document {document_id}")
+        return len(keys)
+    
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "max_size": self.max_entries,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
@@ -0,0 +1 @@
+# Schema migrations package
\ No newline at end of file
@@ -0,0 +1,92 @@
+import os
+import sys
+import logging
+from datetime import datetime
+from contextlib import contextmanager
+from sqlalchemy import text
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from migrations import v001_hot_lookup_indexes, v002_document_blobs
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Every migration, in order. Each module defines VERSION, DESCRIPTION,
+# upgrade(connection) and downgrade(connection).
+MIGRATIONS = [
+    v001_hot_lookup_indexes,
+    v002_document_blobs,
+]
+
+# Arbitrary key for the PostgreSQL advisory lock that serializes migrations
+# when several workers start at once
+MIGRATION_LOCK_KEY = 7234001
+
+@contextmanager
+def migration_transaction(engine):
+    """Open a migration transaction, holding the migration lock on PostgreSQL
+    
+    Migrations rewrite whole tables, so the per-statement timeout applied
+    to every pooled connection (DB_STATEMENT_TIMEOUT_MS) is lifted for the
+    length of the transaction.
+    """
+    with engine.begin() as connection:
+        if engine.dialect.name == 'postgresql':
+            connection.execute(text("SET LOCAL statement_timeout = 0"))
+            connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        yield connection
+
+def applied_versions(connection) -> set:
+    """Get the versions recorded in schema_migrations"""
+    connection.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        "version INTEGER PRIMARY KEY, description VARCHAR(255), applied_at TIMESTAMP)"
+    ))
+    return {row[0] for row in connection.execute(text("SELECT version FROM schema_migrations"))}
+
+def migrate(engine):
+    """Apply pending migrations, each in its own transaction
+    
+    Args:
+        engine: SQLAlchemy engine
+        
+    Returns:
+        Versions that were applied
+    """
+    applied = []
+    for migration in MIGRATIONS:
+        with migration_transaction(engine) as connection:
+            if migration.VERSION in applied_versions(connection):
+                continue
+            
+            logger.info(f"Applying migration {migration.VERSION}: {migration.DESCRIPTION}")
+            migration.upgrade(connection)
+            connection.execute(
+                text("INSERT INTO schema_migrations (version, description, applied_at) VALUES (:version, :description, :applied_at)"),
+                {"version": migration.VERSION, "description": migration.DESCRIPTION, "applied_at": datetime.utcnow()}
+            )
+            applied.append(migration.VERSION)
+    return applied
+
+def rollback(engine, version: int):
+    """Revert one applied migration
+    
+    Args:
+        engine: SQLAlchemy engine
+        version: Version to revert
+    """
+    migration = next(m for m in MIGRATIONS if m.VERSION == version)
+    with migration_transaction(engine) as connection:
+        if version not in applied_versions(connection):
+            return
+        logger.info(f"Reverting migration {version}: {migration.DESCRIPTION}")
+        migration.downgrade(connection)
+        connection.execute(text("DELETE FROM schema_migrations WHERE version = :version"), {"version": version})
+
+if __name__ == "__main__":
+    from models import engine, Base
+    Base.metadata.create_all(engine)
+    print(f"Applied migrations: {migrate(engine) or 'none pending'}")
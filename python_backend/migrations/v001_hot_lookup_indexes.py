@@ -0,0 +1,27 @@
+"""Add indexes for the job status, job results and student documents lookups"""
+
+from sqlalchemy import text
+
+VERSION = 1
+DESCRIPTION = "Indexes on hot lookup columns"
+
+# (index name, table, columns), matching the Index definitions in models.py
+INDEXES = [
+    ('ix_document_chunks_document_id_chunk_index', 'document_chunks', ['document_id', 'chunk_index']),
+    ('ix_jobs_status_created_at', 'jobs', ['status', 'created_at']),
+    ('ix_job_results_job_id_id', 'job_results', ['job_id', 'id']),
+    ('ix_generated_documents_job_id_id', 'generated_documents', ['job_id', 'id']),
+    ('ix_generated_documents_student_email_generated_at', 'generated_documents', ['student_email', 'generated_at']),
+    ('ix_job_tasks_status_stage_id', 'job_tasks', ['status', 'stage', 'id']),
+    ('ix_job_tasks_job_id', 'job_tasks', ['job_id']),
+]
+
+def upgrade(connection):
+    """Create the indexes (tables created after this migration already have them)"""
+    for name, table, columns in INDEXES:
+        connection.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"))
+
+def downgrade(connection):
+    """Drop the indexes"""
+    for name, _, _ in INDEXES:
+        connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
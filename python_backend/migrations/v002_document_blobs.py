@@ -0,0 +1,81 @@
+"""Move generated document content into deduplicated, compressed blobs"""
+
+import zlib
+import hashlib
+from datetime import datetime
+from sqlalchemy import text, inspect, MetaData, Table, Column, String, LargeBinary, Integer, DateTime
+
+VERSION = 2
+DESCRIPTION = "Deduplicated document content blobs"
+
+# Rows backfilled per statement batch
+BATCH_SIZE = 1000
+
+# Matches DocumentBlob in models.py
+metadata = MetaData()
+document_blobs = Table(
+    'document_blobs', metadata,
+    Column('hash', String(64), primary_key=True),
+    Column('content', LargeBinary, nullable=False),
+    Column('size', Integer, nullable=False),
+    Column('created_at', DateTime)
+)
+
+def _insert_blobs(connection, blobs):
+    """Insert blobs, skipping hashes that already exist"""
+    if connection.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    connection.execute(insert(document_blobs).on_conflict_do_nothing(), list(blobs.values()))
+
+def upgrade(connection):
+    """Create document_blobs, add generated_documents.content_hash and backfill it"""
+    document_blobs.create(connection, checkfirst=True)
+    columns = {column['name'] for column in inspect(connection).get_columns('generated_documents')}
+    if 'content_hash' not in columns:
+        connection.execute(text(
+            "ALTER TABLE generated_documents ADD COLUMN content_hash VARCHAR(64) REFERENCES document_blobs (hash)"
+        ))
+    
+    # Move content into blobs in batches, emptying the old column as we go
+    while True:
+        rows = connection.execute(text(
+            "SELECT id, content FROM generated_documents "
+            "WHERE content_hash IS NULL AND content IS NOT NULL ORDER BY id LIMIT :limit"
+        ), {"limit": BATCH_SIZE}).fetchall()
+        if not rows:
+            break
+        
+        blobs, updates = {}, []
+        now = datetime.utcnow()
+        for row_id, content in rows:
+            data = content.encode('utf-8')
+            digest = hashlib.sha256(data).hexdigest()
+            if digest not in blobs:
+                blobs[digest] = {'hash': digest, 'content': zlib.compress(data), 'size': len(data), 'created_at': now}
+            updates.append({'id': row_id, 'hash': digest})
+        
+        _insert_blobs(connection, blobs)
+        connection.execute(
+            text("UPDATE generated_documents SET content_hash = :hash, content = NULL WHERE id = :id"),
+            updates
+        )
+
+def downgrade(connection):
+    """Copy blob content back into generated_documents.content and drop the blobs"""
+    while True:
+        rows = connection.execute(text(
+            "SELECT g.id, b.content FROM generated_documents g "
+            "JOIN document_blobs b ON b.hash = g.content_hash "
+            "WHERE g.content IS NULL ORDER BY g.id LIMIT :limit"
+        ), {"limit": BATCH_SIZE}).fetchall()
+        if not rows:
+            break
+        connection.execute(
+            text("UPDATE generated_documents SET content = :content WHERE id = :id"),
+            [{'id': row_id, 'content': zlib.decompress(blob).decode('utf-8')} for row_id, blob in rows]
+        )
+    
+    connection.execute(text("ALTER TABLE generated_documents DROP COLUMN content_hash"))
+    document_blobs.drop(connection, checkfirst=True)
@@ -1,15 +1,82 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, Float, DateTime, ForeignKey, Boolean, JSON
+from sqlalchemy import create_engine, event, Index, Column, Integer, String, Text, Float, DateTime, ForeignKey, Boolean, JSON, LargeBinary
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship, sessionmaker
+from sqlalchemy.orm import relationship, sessionmaker, deferred
+from contextlib import contextmanager
 from datetime import datetime
+import os
 import json
+import zlib
+import hashlib
+import threading
 import config
 
+def build_engine(url: str = None):
+    """Create the SQLAlchemy engine with the pool settings from config"""
+    url = url or config.DB_URL
+    options = {"pool_pre_ping": config.DB_POOL_PRE_PING}
+    
+    if not url.startswith('sqlite'):
+        options.update(
+            pool_size=config.DB_POOL_SIZE,
+            max_overflow=config.DB_MAX_OVERFLOW,
+            pool_timeout=config.DB_POOL_TIMEOUT,
+            pool_recycle=config.DB_POOL_RECYCLE
+        )
+    if url.startswith('postgresql') and config.DB_STATEMENT_TIMEOUT_MS:
+        options["connect_args"] = {"options": f"-c statement_timeout={config.DB_STATEMENT_TIMEOUT_MS}"}
+    
+    return create_engine(url, **options)
+
 # Create SQLAlchemy engine and session
-engine = create_engine(config.DB_URL)
+engine = build_engine()
 Session = sessionmaker(bind=engine)
 Base = declarative_base()
 
+@contextmanager
+def session_scope():
+    """Provide a session that is committed on success and always closed"""
+    session = Session()
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+# Pool event counters, reported by pool_stats()
+_pool_counters = {"connects": 0, "checkouts": 0, "invalidations": 0}
+_pool_counters_lock = threading.Lock()
+
+def _count(name):
+    """Make a pool event listener that increments a counter"""
+    def listener(*args):
+        with _pool_counters_lock:
+            _pool_counters[name] += 1
+    return listener
+
+event.listen(engine, 'connect', _count('connects'))
+event.listen(engine, 'checkout', _count('checkouts'))
+event.listen(engine, 'invalidate', _count('invalidations'))
+
+def pool_stats():
+    """Get connection pool utilization for this process"""
+    pool = engine.pool
+    with _pool_counters_lock:
+        stats = dict(_pool_counters)
+    stats["pool"] = type(pool).__name__
+    for name in ('size', 'checkedin', 'checkedout', 'overflow'):
+        if hasattr(pool, name):
+            stats[name] = getattr(pool, name)()
+    if 'size' in stats:
+        stats["utilization"] = stats["checkedout"] / max(stats["size"] + config.DB_MAX_OVERFLOW, 1)
+    return stats
+
+# A forked gunicorn worker must open its own connections, never reuse the parent's
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=lambda: engine.dispose(close=False))
+
 class Document(Base):
     """Document model for storing uploaded documents"""
     __tablename__ = 'documents'
@@ -32,6 +99,9 @@ class Document(Base):
 class DocumentChunk(Base):
     """Document chunk model for storing chunks of text from documents"""
     __tablename__ = 'document_chunks'
+    __table_args__ = (
+        Index('ix_document_chunks_document_id_chunk_index', 'document_id', 'chunk_index'),
+    )
     
     id = Column(Integer, primary_key=True)
     document_id = Column(Integer, ForeignKey('documents.id'), nullable=False)
@@ -55,6 +125,9 @@ class DocumentChunk(Base):
 class Job(Base):
     """Job model for storing processing jobs"""
     __tablename__ = 'jobs'
+    __table_args__ = (
+        Index('ix_jobs_status_created_at', 'status', 'created_at'),
+    )
     
     id = Column(Integer, primary_key=True)
     job_id = Column(String(36), unique=True, nullable=False)  # UUID
@@ -67,8 +140,9 @@ class Job(Base):
     
     # Relationships
     documents = relationship("Document", secondary="job_documents", back_populates="jobs")
-    results = relationship("JobResult", back_populates="job", cascade="all, delete-orphan")
-    generated_documents = relationship("GeneratedDocument", back_populates="job", cascade="all, delete-orphan")
+    results = relationship("JobResult", back_populates="job", cascade="all, delete-orphan", order_by="JobResult.id")
+    generated_documents = relationship("GeneratedDocument", back_populates="job", cascade="all, delete-orphan", order_by="GeneratedDocument.id")
+    tasks = relationship("JobTask", back_populates="job", cascade="all, delete-orphan")
     
     def __repr__(self):
         return f"<Job(job_id='{self.job_id}', status='{self.status}', created_at='{self.created_at}')>"
@@ -83,6 +157,9 @@ class JobDocument(Base):
 class JobResult(Base):
     """Job result model for storing processing results"""
     __tablename__ = 'job_results'
+    __table_args__ = (
+        Index('ix_job_results_job_id_id', 'job_id', 'id'),
+    )
     
     id = Column(Integer, primary_key=True)
     job_id = Column(Integer, ForeignKey('jobs.id'), nullable=False)
@@ -103,6 +180,10 @@ class JobResult(Base):
 class GeneratedDocument(Base):
     """Generated document model for storing personalized documents"""
     __tablename__ = 'generated_documents'
+    __table_args__ = (
+        Index('ix_generated_documents_job_id_id', 'job_id', 'id'),
+        Index('ix_generated_documents_student_email_generated_at', 'student_email', 'generated_at'),
+    )
     
     id = Column(Integer, primary_key=True)
     job_id = Column(Integer, ForeignKey('jobs.id'), nullable=False)
@@ -112,17 +193,107 @@ class GeneratedDocument(Base):
     document_type = Column(String(50), nullable=False)  # 'markdown', 'pdf', 'docx'
     file_path = Column(String(512), nullable=False)
     generated_at = Column(DateTime, default=datetime.utcnow)
-    content = Column(Text, nullable=True)  # Store the content for markdown
+    content_hash = Column(String(64), ForeignKey('document_blobs.hash'), nullable=True)  # Markdown source
+    legacy_content = deferred(Column('content', Text, nullable=True))  # Before blobs; emptied by migration 2
     
     # Relationships
     job = relationship("Job", back_populates="generated_documents")
+    blob = relationship("DocumentBlob")
     
     def __repr__(self):
         return f"<GeneratedDocument(id={self.id}, student_email='{self.student_email}', document_type='{self.document_type}')>"
+    
+    @property
+    def content(self):
+        """Markdown source of the document (loads the blob on first access)"""
+        if self.content_hash:
+            return self.blob.get_text()
+        return self.legacy_content
 
-# Create all tables
+class DocumentBlob(Base):
+    """Compressed document content, stored once per distinct content"""
+    __tablename__ = 'document_blobs'
+    
+    hash = Column(String(64), primary_key=True)  # SHA-256 of the UTF-8 content
+    content = Column(LargeBinary, nullable=False)  # zlib-compressed
+    size = Column(Integer, nullable=False)  # Uncompressed bytes
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<DocumentBlob(hash='{self.hash[:12]}', size={self.size})>"
+    
+    def get_text(self):
+        """Get the content as text"""
+        return zlib.decompress(self.content).decode('utf-8')
+    
+    @staticmethod
+    def row(text):
+        """Column values of the blob for a text
+        
+        Args:
+            text: Document content
+            
+        Returns:
+            Dictionary of column values, including the hash
+        """
+        data = text.encode('utf-8')
+        return {
+            'hash': hashlib.sha256(data).hexdigest(),
+            'content': zlib.compress(data),
+            'size': len(data),
+            'created_at': datetime.utcnow()
+        }
+
+def insert_ignore(session, model, rows):
+    """Insert rows, skipping those whose primary key already exists
+    
+    Args:
+        session: Database session
+        model: Model class, e.g. DocumentBlob
+        rows: Column values of each row
+    """
+    if not rows:
+        return
+    if session.get_bind().dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    session.execute(insert(model.__table__).on_conflict_do_nothing(), rows)
+
+class JobTask(Base):
+    """Job task model for the persistent background task queue"""
+    __tablename__ = 'job_tasks'
+    __table_args__ = (
+        Index('ix_job_tasks_status_stage_id', 'status', 'stage', 'id'),
+        Index('ix_job_tasks_job_id', 'job_id'),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    job_id = Column(Integer, ForeignKey('jobs.id'), nullable=False)
+    stage = Column(String(50), nullable=False)  # 'ingest', 'generate'
+    status = Column(String(50), nullable=False, default='queued')  # 'queued', 'running', 'completed', 'failed'
+    payload = Column(JSON, nullable=True)
+    attempts = Column(Integer, default=0)
+    max_attempts = Column(Integer, default=3)
+    error = Column(Text, nullable=True)
+    worker_id = Column(String(255), nullable=True)
+    enqueued_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    
+    # Relationships
+    job = relationship("Job", back_populates="tasks")
+    
+    def __repr__(self):
+        return f"<JobTask(id={self.id}, stage='{self.stage}', status='{self.status}')>"
+
+# Create all tables and apply pending schema migrations
 def init_db():
     Base.metadata.create_all(engine)
+    
+    from migrations.runner import migrate
+    migrate(engine)
 
 if __name__ == "__main__":
     init_db()
\ No newline at end of file
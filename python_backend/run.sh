@@ -26,4 +26,4 @@ python -c "from models import init_db; init_db()"
 
 # Run the application
 echo "Starting the server on port 3798..."
-gunicorn --bind 0.0.0.0:3798 --timeout 120 app:app
\ No newline at end of file
+gunicorn --bind 0.0.0.0:3798 --timeout 120 --worker-class gthread --threads 32 app:app
\ No newline at end of file
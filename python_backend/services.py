@@ -0,0 +1,72 @@
+import os
+import logging
+import threading
+
+from vector_db.vector_store import VectorStore, build_embeddings
+from vector_db.document_processor import DocumentProcessor
+from llm_agent.agent import LLMAgent
+from llm_agent.ollama_client import OllamaClient
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Process-wide service registry. Services are created lazily on first use
+# and shared by every request handler and background job in the process.
+_services = {}
+_lock = threading.RLock()
+
+def _get_or_create(name, factory):
+    """Get a service, creating it once if needed"""
+    service = _services.get(name)
+    if service is None:
+        with _lock:
+            service = _services.get(name)
+            if service is None:
+                logger.info(f"Creating shared service '{name}' in process {os.getpid()}")
+                service = factory()
+                _services[name] = service
+    return service
+
+def peek(name):
+    """Get a service only if it has already been created"""
+    return _services.get(name)
+
+def get_embeddings():
+    """Get the shared embeddings model"""
+    return _get_or_create('embeddings', build_embeddings)
+
+def get_vector_store(collection_name: str = "documents") -> VectorStore:
+    """Get the shared vector store for a collection"""
+    return _get_or_create(
+        f'vector_store:{collection_name}',
+        lambda: VectorStore(collection_name, embeddings=get_embeddings())
+    )
+
+def get_ollama_client() -> OllamaClient:
+    """Get the shared Ollama client"""
+    return _get_or_create('ollama_client', OllamaClient)
+
+def get_llm_agent() -> LLMAgent:
+    """Get the shared LLM agent"""
+    return _get_or_create(
+        'llm_agent',
+        lambda: LLMAgent(vector_store=get_vector_store(), llm=get_ollama_client())
+    )
+
+def get_document_processor() -> DocumentProcessor:
+    """Get the shared document processor"""
+    return _get_or_create(
+        'document_processor',
+        lambda: DocumentProcessor(vector_store=get_vector_store())
+    )
+
+def reset():
+    """Drop every shared service (the next call recreates them)"""
+    global _lock
+    _services.clear()
+    _lock = threading.RLock()
+
+# A forked worker must not reuse the parent's models, clients or locks
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=reset)
@@ -0,0 +1 @@
+# Skill analysis package
\ No newline at end of file
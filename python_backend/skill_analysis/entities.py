@@ -0,0 +1,74 @@
+import os
+import sys
+import logging
+import threading
+from typing import List, Optional
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Only the entity recognizer is needed; en_core_web_sm's ner has its own tok2vec
+DISABLED_PIPES = ['tok2vec', 'tagger', 'parser', 'attribute_ruler', 'lemmatizer', 'senter']
+
+class EntitySkillExtractor:
+    """Extract skill candidates from named entities with spaCy
+    
+    The spaCy model is loaded on first use, so configuring this extractor
+    costs nothing until a text is actually processed.
+    """
+    
+    def __init__(self, model_name: str = None, labels: Optional[List[str]] = None, batch_size: int = None):
+        """Initialize the entity extractor
+        
+        Args:
+            model_name: Name of the spaCy model (default: from config)
+            labels: Entity labels to keep (default: from config)
+            batch_size: Batch size for nlp.pipe (default: from config)
+        """
+        self.model_name = model_name or config.SPACY_MODEL
+        self.labels = set(labels or config.SPACY_ENTITY_LABELS)
+        self.batch_size = batch_size or config.SPACY_BATCH_SIZE
+        self._nlp = None
+        self._lock = threading.Lock()
+    
+    @property
+    def nlp(self):
+        """Load the spaCy model with unused pipeline components disabled"""
+        if self._nlp is None:
+            with self._lock:
+                if self._nlp is None:
+                    import spacy
+                    try:
+                        self._nlp = spacy.load(self.model_name, disable=DISABLED_PIPES)
+                    except OSError:
+                        logger.error(f"spaCy model '{self.model_name}' is not installed. "
+                                     f"Install it with: python -m spacy download {self.model_name}")
+                        raise
+                    logger.info(f"Loaded spaCy model '{self.model_name}' with pipes {self._nlp.pipe_names}")
+        return self._nlp
+    
+    def extract_batch(self, texts: List[str]) -> List[List[str]]:
+        """Extract entity texts from a batch of documents
+        
+        Args:
+            texts: List of texts
+            
+        Returns:
+            List of lowercased entity texts for each input text
+        """
+        results = []
+        for doc in self.nlp.pipe(texts, batch_size=self.batch_size):
+            entities = []
+            for ent in doc.ents:
+                if ent.label_ in self.labels:
+                    entity = ent.text.strip().lower()
+                    if entity and entity not in entities:
+                        entities.append(entity)
+            results.append(entities)
+        return results
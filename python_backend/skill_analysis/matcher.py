@@ -0,0 +1,113 @@
+import os
+import sys
+import re
+import logging
+from typing import Dict, List, Set
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skill_analysis.skills import SKILLS
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_WORD_CHAR = re.compile(r'\w')
+
+class SkillMatcher:
+    """Find every skill of a vocabulary in a text with a single regex scan"""
+    
+    def __init__(self, vocabulary: Dict[str, List[str]]):
+        """Compile the matcher for a skills vocabulary
+        
+        Args:
+            vocabulary: Mapping of category name to list of skills
+        """
+        self.vocabulary = {category: list(skills) for category, skills in vocabulary.items()}
+        
+        # Map each skill to the categories it belongs to
+        self.skill_categories = {}
+        for category, skills in self.vocabulary.items():
+            for skill in skills:
+                self.skill_categories.setdefault(skill, []).append(category)
+        
+        # A zero-width lookahead lets every position report its longest skill,
+        # so overlapping skills ("big data" / "data science") are all found
+        self.pattern = re.compile(r'(?=\b(' + self._build_trie_pattern(self.skill_categories) + r')\b)')
+        
+        # Shorter skills that always match where a longer one does ("java" is
+        # not implied by "javascript", but "rest" would be implied by "rest api")
+        self.implied = {
+            skill: [
+                other for other in self.skill_categories
+                if other != skill and skill.startswith(other) and self._ends_on_boundary(other, skill)
+            ]
+            for skill in self.skill_categories
+        }
+        
+        logger.info(f"Skill matcher compiled for {len(self.skill_categories)} skills")
+    
+    def _build_trie_pattern(self, skills) -> str:
+        """Build a regex alternation shaped as a prefix trie
+        
+        Args:
+            skills: Iterable of skills
+            
+        Returns:
+            Regex source matching any skill, preferring the longest
+        """
+        trie = {}
+        for skill in skills:
+            node = trie
+            for char in skill:
+                node = node.setdefault(char, {})
+            node[''] = {}
+        
+        def build(node):
+            branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ''
+            body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+            # Greedy optional group: try the longer skill first, backtrack to this one
+            return '(?:' + body + ')?' if '' in node else body
+        
+        return build(trie)
+    
+    def _ends_on_boundary(self, prefix: str, skill: str) -> bool:
+        """Check if a word boundary follows prefix when it starts skill"""
+        return bool(_WORD_CHAR.match(prefix[-1])) != bool(_WORD_CHAR.match(skill[len(prefix)]))
+    
+    def match(self, text: str) -> Set[str]:
+        """Find all skills in a text
+        
+        Args:
+            text: Text to scan
+            
+        Returns:
+            Set of skills found
+        """
+        found = set()
+        for match in self.pattern.finditer(text.lower()):
+            skill = match.group(1)
+            found.add(skill)
+            found.update(self.implied[skill])
+        return found
+    
+    def extract(self, text: str) -> Dict[str, List[str]]:
+        """Extract skills from text grouped by category
+        
+        Args:
+            text: Text to scan
+            
+        Returns:
+            Dictionary of category to skills, in vocabulary order
+        """
+        found = self.match(text)
+        return {
+            category: [skill for skill in skills if skill in found]
+            for category, skills in self.vocabulary.items()
+        }
+
+# Compiled once per process
+skill_matcher = SkillMatcher(SKILLS)
@@ -0,0 +1,82 @@
+import os
+import sys
+import re
+import logging
+from functools import lru_cache
+from typing import Dict, Any
+from nltk.corpus import stopwords
+from nltk.stem import WordNetLemmatizer
+from nltk.tokenize import NLTKWordTokenizer
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class TextNormalizer:
+    """Lowercase, tokenize, drop stopwords and lemmatize text
+    
+    NLTK resources are loaded once when the normalizer is created, and
+    lemmas are memoized in a bounded LRU cache since the same tokens
+    repeat across every student in a cohort.
+    """
+    
+    def __init__(self, cache_size: int = None):
+        """Initialize the normalizer
+        
+        Args:
+            cache_size: Maximum number of cached lemmas (default: from config)
+        """
+        self.non_letters = re.compile(r'[^a-zA-Z\s]')
+        self.stop_words = frozenset(stopwords.words('english'))
+        self.lemmatizer = WordNetLemmatizer()
+        # Text has no sentence punctuation left, so word_tokenize's sentence
+        # split is a no-op and the word tokenizer can be used directly
+        self.tokenizer = NLTKWordTokenizer()
+        self.lemmatize = lru_cache(maxsize=cache_size or config.LEMMA_CACHE_SIZE)(self.lemmatizer.lemmatize)
+    
+    def normalize(self, text: str) -> str:
+        """Normalize text for analysis
+        
+        Args:
+            text: Text to normalize
+            
+        Returns:
+            Space-separated lemmas
+        """
+        # Convert to lowercase and remove special characters and numbers
+        text = self.non_letters.sub('', text.lower())
+        
+        tokens = self.tokenizer.tokenize(text)
+        lemmatize = self.lemmatize
+        stop_words = self.stop_words
+        return ' '.join(lemmatize(word) for word in tokens if word not in stop_words)
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Get lemma cache statistics"""
+        info = self.lemmatize.cache_info()
+        lookups = info.hits + info.misses
+        return {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "max_size": info.maxsize,
+            "hit_rate": info.hits / lookups if lookups else 0.0
+        }
+    
+    def clear_cache(self):
+        """Clear the lemma cache"""
+        self.lemmatize.cache_clear()
+
+_normalizer = None
+
+def get_normalizer() -> TextNormalizer:
+    """Get the process-wide text normalizer"""
+    global _normalizer
+    if _normalizer is None:
+        _normalizer = TextNormalizer()
+    return _normalizer
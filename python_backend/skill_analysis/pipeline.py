@@ -0,0 +1,77 @@
+import os
+import sys
+import logging
+from typing import Dict, List, Optional
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from skill_analysis.matcher import SkillMatcher, skill_matcher
+from skill_analysis.entities import EntitySkillExtractor
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class SkillExtractionPipeline:
+    """Skill extraction stages: vocabulary matching plus optional spaCy entities"""
+    
+    def __init__(self, matcher: SkillMatcher = None, entity_extractor: Optional[EntitySkillExtractor] = None):
+        """Initialize the pipeline
+        
+        Args:
+            matcher: Vocabulary matcher (default: the shared compiled matcher)
+            entity_extractor: Optional entity-based extractor
+        """
+        self.matcher = matcher or skill_matcher
+        self.entity_extractor = entity_extractor
+    
+    def extract(self, text: str, raw_text: str = None) -> Dict[str, List[str]]:
+        """Extract skills from a single text
+        
+        Args:
+            text: Preprocessed text to match against the vocabulary
+            raw_text: Original text for entity recognition (default: text)
+            
+        Returns:
+            Dictionary of category to skills
+        """
+        return self.extract_batch([text], [raw_text] if raw_text is not None else None)[0]
+    
+    def extract_batch(self, texts: List[str], raw_texts: List[str] = None) -> List[Dict[str, List[str]]]:
+        """Extract skills from a batch of texts
+        
+        Args:
+            texts: Preprocessed texts to match against the vocabulary
+            raw_texts: Original texts for entity recognition (default: texts)
+            
+        Returns:
+            List of dictionaries of category to skills
+        """
+        results = [self.matcher.extract(text) for text in texts]
+        
+        if self.entity_extractor is not None:
+            entity_lists = self.entity_extractor.extract_batch(raw_texts if raw_texts is not None else texts)
+            for skills, entities in zip(results, entity_lists):
+                self._merge_entities(skills, entities)
+        
+        return results
+    
+    def _merge_entities(self, skills: Dict[str, List[str]], entities: List[str]):
+        """Add entity texts to the skills, using vocabulary categories when known"""
+        for entity in entities:
+            for category in self.matcher.skill_categories.get(entity, ['technical']):
+                if entity not in skills[category]:
+                    skills[category].append(entity)
+
+def build_pipeline() -> SkillExtractionPipeline:
+    """Build the pipeline configured in config.SKILL_EXTRACTORS"""
+    entity_extractor = None
+    if 'entities' in config.SKILL_EXTRACTORS:
+        entity_extractor = EntitySkillExtractor()
+        logger.info("Entity-based skill extraction enabled")
+    return SkillExtractionPipeline(entity_extractor=entity_extractor)
+
+# Shared per process; spaCy is only loaded if the entity stage is configured and used
+skill_pipeline = build_pipeline()
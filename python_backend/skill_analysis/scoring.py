@@ -0,0 +1,148 @@
+import os
+import sys
+import logging
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from typing import Dict, List
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skill_analysis.pipeline import SkillExtractionPipeline, skill_pipeline
+from skill_analysis.normalizer import TextNormalizer, get_normalizer
+from cpu_pool import CPUPool, get_cpu_pool
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Column lookups, in order of preference
+NAME_COLUMNS = ['full name of the student', 'Name', 'name']
+EMAIL_COLUMNS = ['email', 'Email']
+STUDENT_ID_COLUMNS = ['Roll_Number', 'RollNumber', 'ID', 'StudentID']
+
+# Match score thresholds for each status
+SUCCESS_THRESHOLD = 70
+PARTIAL_SUCCESS_THRESHOLD = 40
+
+def match_status(match_score: float) -> str:
+    """Get the status for a match score"""
+    if match_score >= SUCCESS_THRESHOLD:
+        return 'Success'
+    elif match_score >= PARTIAL_SUCCESS_THRESHOLD:
+        return 'Partial Success'
+    return 'Failure'
+
+def _first_column(df: pd.DataFrame, columns: List[str], default: pd.Series) -> pd.Series:
+    """Get the first of columns present in df, or the default"""
+    for column in columns:
+        if column in df.columns:
+            return df[column]
+    return default
+
+def profile_texts(df: pd.DataFrame) -> pd.Series:
+    """Join the string values of every row into one profile text
+    
+    Args:
+        df: Student DataFrame
+        
+    Returns:
+        Series of profile texts, one per row
+    """
+    texts = pd.Series('', index=df.index, dtype=object)
+    for column in df.columns:
+        values = df[column]
+        is_text = values.map(lambda value: isinstance(value, str))
+        if is_text.any():
+            texts = texts + values.where(is_text, '') + is_text.map({True: ' ', False: ''})
+    return texts
+
+def extract_profile_skills(raw_texts: List[str]) -> List[Dict[str, List[str]]]:
+    """Normalize profile texts and extract their skills (runs in a CPU pool worker)
+    
+    Args:
+        raw_texts: Profile texts
+        
+    Returns:
+        List of dictionaries of category to skills
+    """
+    normalizer = get_normalizer()
+    return skill_pipeline.extract_batch([normalizer.normalize(text) for text in raw_texts], raw_texts)
+
+def score_cohort(
+    df: pd.DataFrame,
+    job_skills: Dict[str, List[str]],
+    start: int = 0,
+    pipeline: SkillExtractionPipeline = None,
+    normalizer: TextNormalizer = None,
+    pool: CPUPool = None
+) -> pd.DataFrame:
+    """Score every student in a DataFrame against a job's skills
+    
+    Skills are extracted per row, then all match scores are computed at once
+    from a sparse student x skill incidence matrix and the job skill vector.
+    
+    Args:
+        df: Student DataFrame
+        job_skills: Skills extracted from the job description
+        start: Position of the first row in the whole cohort (for default names)
+        pipeline: Skill extraction pipeline (default: the shared pipeline)
+        normalizer: Text normalizer (default: the shared normalizer)
+        pool: CPU pool that skill extraction is sharded across (default: the
+            shared pool; only used with the default pipeline and normalizer)
+        
+    Returns:
+        DataFrame with name, email, student_id, skills, match_score and status
+    """
+    positions = np.arange(start, start + len(df))
+    
+    # Extract skills for every student, sharding rows across processes
+    raw_texts = profile_texts(df).tolist()
+    if pipeline is None and normalizer is None:
+        student_skills = (pool or get_cpu_pool()).map_shards(extract_profile_skills, raw_texts)
+    else:
+        pipeline = pipeline or skill_pipeline
+        normalizer = normalizer or get_normalizer()
+        student_skills = pipeline.extract_batch([normalizer.normalize(text) for text in raw_texts], raw_texts)
+    
+    # Build the student x skill incidence matrix
+    skill_index = {}
+    indptr = [0]
+    indices = []
+    for skills in student_skills:
+        row = {skill_index.setdefault(skill, len(skill_index)) for skill_list in skills.values() for skill in skill_list}
+        indices.extend(row)
+        indptr.append(len(indices))
+    
+    job_skills_flat = [skill for skill_list in job_skills.values() for skill in skill_list]
+    job_vector = np.zeros(len(skill_index))
+    for skill in set(job_skills_flat):
+        if skill in skill_index:
+            job_vector[skill_index[skill]] = 1
+    
+    incidence = sparse.csr_matrix(
+        (np.ones(len(indices)), np.array(indices, dtype=np.int64), np.array(indptr, dtype=np.int64)),
+        shape=(len(df), len(skill_index))
+    )
+    
+    # Match score is the share of job skills the student has, capped at 100%
+    if job_skills_flat:
+        scores = np.minimum(incidence @ job_vector / len(job_skills_flat) * 100, 100)
+    else:
+        scores = np.zeros(len(df))
+    
+    statuses = np.select(
+        [scores >= SUCCESS_THRESHOLD, scores >= PARTIAL_SUCCESS_THRESHOLD],
+        ['Success', 'Partial Success'],
+        default='Failure'
+    )
+    
+    return pd.DataFrame({
+        'name': _first_column(df, NAME_COLUMNS, pd.Series([f'Student {i + 1}' for i in positions], index=df.index)),
+        'email': _first_column(df, EMAIL_COLUMNS, pd.Series('', index=df.index)),
+        'student_id': _first_column(df, STUDENT_ID_COLUMNS, pd.Series([f'S{1000 + i}' for i in positions], index=df.index)),
+        'skills': student_skills,
+        'match_score': scores,
+        'status': statuses
+    }, index=df.index)
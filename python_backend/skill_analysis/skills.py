@@ -0,0 +1,30 @@
+# Skills dictionary for matching
+SKILLS = {
+    'technical': [
+        'python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'php', 'swift', 'kotlin',
+        'react', 'angular', 'vue', 'node.js', 'express', 'django', 'flask', 'spring',
+        'sql', 'nosql', 'mongodb', 'mysql', 'postgresql', 'oracle', 'firebase',
+        'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'git', 'github',
+        'machine learning', 'deep learning', 'ai', 'data science', 'big data',
+        'hadoop', 'spark', 'tableau', 'power bi', 'excel', 'vba',
+        'html', 'css', 'sass', 'less', 'bootstrap', 'tailwind',
+        'rest api', 'graphql', 'microservices', 'serverless',
+        'linux', 'unix', 'windows', 'macos', 'android', 'ios',
+        'agile', 'scrum', 'kanban', 'jira', 'confluence'
+    ],
+    'soft': [
+        'communication', 'teamwork', 'leadership', 'problem solving', 'critical thinking',
+        'time management', 'organization', 'adaptability', 'flexibility', 'creativity',
+        'work ethic', 'interpersonal skills', 'emotional intelligence', 'conflict resolution',
+        'decision making', 'stress management', 'attention to detail', 'customer service',
+        'presentation', 'negotiation', 'persuasion', 'mentoring', 'coaching'
+    ],
+    'business': [
+        'marketing', 'sales', 'finance', 'accounting', 'hr', 'human resources',
+        'project management', 'product management', 'operations', 'strategy',
+        'business development', 'customer relationship management', 'crm',
+        'supply chain', 'logistics', 'procurement', 'quality assurance', 'qa',
+        'business analysis', 'data analysis', 'market research', 'competitive analysis',
+        'budgeting', 'forecasting', 'risk management', 'compliance', 'legal'
+    ]
+}
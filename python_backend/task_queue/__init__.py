@@ -0,0 +1 @@
+# Task queue package
\ No newline at end of file
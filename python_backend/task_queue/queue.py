@@ -0,0 +1,228 @@
+import os
+import sys
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
+from sqlalchemy import and_, or_, func
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from models import JobTask, Session
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class TaskQueue:
+    """Persistent task queue stored in the job_tasks table
+    
+    Tasks are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so any number
+    of worker threads and processes can share the queue. A running task
+    whose heartbeat is older than the lease is claimed again, which is how
+    work survives a process restart.
+    """
+    
+    def enqueue(self, job_id: int, stage: str, payload: Dict[str, Any] = None, session=None) -> int:
+        """Add a task to the queue
+        
+        Args:
+            job_id: Database ID of the job
+            stage: Stage name
+            payload: JSON payload passed to the stage handler
+            session: Session to add the task in (committed by the caller)
+            
+        Returns:
+            ID of the new task
+        """
+        own_session = session is None
+        session = session or Session()
+        try:
+            task = JobTask(
+                job_id=job_id,
+                stage=stage,
+                status='queued',
+                payload=payload or {},
+                attempts=0,
+                max_attempts=config.TASK_MAX_ATTEMPTS,
+                enqueued_at=datetime.utcnow()
+            )
+            session.add(task)
+            session.flush()
+            if own_session:
+                session.commit()
+            logger.info(f"Enqueued '{stage}' task {task.id} for job {job_id}")
+            return task.id
+        except Exception:
+            if own_session:
+                session.rollback()
+            raise
+        finally:
+            if own_session:
+                session.close()
+    
+    def claim(self, worker_id: str, stages: List[str]) -> Optional[Dict[str, Any]]:
+        """Claim the oldest available task
+        
+        Args:
+            worker_id: Identifier of the claiming worker
+            stages: Stages this worker can run
+            
+        Returns:
+            Task dictionary, or None if the queue is empty
+        """
+        session = Session()
+        try:
+            now = datetime.utcnow()
+            lease_expired = now - timedelta(seconds=config.TASK_LEASE_SECONDS)
+            task = session.query(JobTask).filter(
+                JobTask.stage.in_(stages),
+                or_(
+                    JobTask.status == 'queued',
+                    and_(JobTask.status == 'running', JobTask.heartbeat_at < lease_expired)
+                )
+            ).order_by(JobTask.id).with_for_update(skip_locked=True).first()
+            
+            if not task:
+                session.commit()
+                return None
+            
+            if task.status == 'running':
+                logger.warning(f"Reclaiming task {task.id} from stale worker {task.worker_id}")
+            
+            # Conditional update, so a database without row locks still hands
+            # each task to exactly one worker
+            attempts = (task.attempts or 0) + 1
+            claimed = session.query(JobTask).filter(
+                JobTask.id == task.id,
+                JobTask.status == task.status,
+                JobTask.attempts == task.attempts
+            ).update({
+                JobTask.status: 'running',
+                JobTask.attempts: attempts,
+                JobTask.worker_id: worker_id,
+                JobTask.started_at: now,
+                JobTask.heartbeat_at: now
+            }, synchronize_session=False)
+            session.commit()
+            
+            if not claimed:
+                return None
+            
+            return {
+                "id": task.id,
+                "job_id": task.job_id,
+                "stage": task.stage,
+                "payload": task.payload or {},
+                "attempts": attempts,
+                "max_attempts": task.max_attempts
+            }
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+    
+    def complete(self, task_id: int, next_stage: Optional[Tuple[str, Dict[str, Any]]] = None):
+        """Mark a task completed, enqueueing the next stage in the same transaction
+        
+        Args:
+            task_id: ID of the task
+            next_stage: Optional (stage, payload) to enqueue for the same job
+        """
+        session = Session()
+        try:
+            task = session.query(JobTask).filter(JobTask.id == task_id).first()
+            task.status = 'completed'
+            task.finished_at = datetime.utcnow()
+            task.error = None
+            if next_stage:
+                stage, payload = next_stage
+                self.enqueue(task.job_id, stage, payload, session=session)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+    
+    def fail(self, task_id: int, error: str) -> bool:
+        """Record a task failure, requeueing it if attempts remain
+        
+        Args:
+            task_id: ID of the task
+            error: Error message
+            
+        Returns:
+            True if the task has permanently failed
+        """
+        session = Session()
+        try:
+            task = session.query(JobTask).filter(JobTask.id == task_id).first()
+            final = task.attempts >= task.max_attempts
+            task.status = 'failed' if final else 'queued'
+            task.error = error
+            task.finished_at = datetime.utcnow() if final else None
+            session.commit()
+            return final
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+    
+    def heartbeat(self, task_ids: List[int]):
+        """Extend the lease of running tasks"""
+        if not task_ids:
+            return
+        session = Session()
+        try:
+            session.query(JobTask).filter(
+                JobTask.id.in_(task_ids),
+                JobTask.status == 'running'
+            ).update({JobTask.heartbeat_at: datetime.utcnow()}, synchronize_session=False)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error sending task heartbeat: {e}")
+        finally:
+            session.close()
+    
+    def stats(self, recent: int = 100) -> Dict[str, Any]:
+        """Get queue depth and stage latency
+        
+        Args:
+            recent: Number of recently finished tasks per stage to average over
+            
+        Returns:
+            Dictionary with task counts by stage and status, and average
+            wait and run times in seconds for each stage
+        """
+        session = Session()
+        try:
+            depth = {}
+            rows = session.query(JobTask.stage, JobTask.status, func.count(JobTask.id)).group_by(
+                JobTask.stage, JobTask.status
+            ).all()
+            for stage, status, count in rows:
+                depth.setdefault(stage, {})[status] = count
+            
+            latency = {}
+            for stage in depth:
+                tasks = session.query(JobTask.enqueued_at, JobTask.started_at, JobTask.finished_at).filter(
+                    JobTask.stage == stage,
+                    JobTask.status == 'completed'
+                ).order_by(JobTask.id.desc()).limit(recent).all()
+                if tasks:
+                    latency[stage] = {
+                        "avg_wait_seconds": sum((t.started_at - t.enqueued_at).total_seconds() for t in tasks) / len(tasks),
+                        "avg_run_seconds": sum((t.finished_at - t.started_at).total_seconds() for t in tasks) / len(tasks),
+                        "samples": len(tasks)
+                    }
+            
+            return {"depth": depth, "latency": latency}
+        finally:
+            session.close()
+
+task_queue = TaskQueue()
@@ -0,0 +1,121 @@
+import os
+import sys
+import socket
+import logging
+import threading
+import traceback
+from typing import Dict, Callable, Optional, Any
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from task_queue.queue import TaskQueue, task_queue
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class WorkerPool:
+    """Threads that claim and run tasks from a TaskQueue
+    
+    Each handler receives (job_id, payload) and may return a
+    (next_stage, payload) tuple, which is enqueued when the task completes.
+    """
+    
+    def __init__(
+        self,
+        handlers: Dict[str, Callable[[int, Dict[str, Any]], Any]],
+        queue: TaskQueue = None,
+        workers: int = None,
+        poll_interval: float = None,
+        on_failed: Optional[Callable[[int, str], None]] = None
+    ):
+        """Initialize the worker pool
+        
+        Args:
+            handlers: Mapping of stage name to handler
+            queue: Task queue to work from (default: shared queue)
+            workers: Number of worker threads (default: from config)
+            poll_interval: Seconds to wait when the queue is empty (default: from config)
+            on_failed: Called with (job_id, error) when a task fails for good
+        """
+        self.handlers = handlers
+        self.queue = queue or task_queue
+        self.workers = workers or config.TASK_WORKERS
+        self.poll_interval = poll_interval or config.TASK_POLL_INTERVAL
+        self.on_failed = on_failed
+        self.worker_prefix = f"{socket.gethostname()}:{os.getpid()}"
+        
+        self._stop = threading.Event()
+        self._threads = []
+        self._running = set()
+        self._running_lock = threading.Lock()
+    
+    def start(self):
+        """Start worker and heartbeat threads"""
+        if self._threads:
+            return
+        self._stop.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, args=(f"{self.worker_prefix}:{i}",), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        heartbeat = threading.Thread(target=self._heartbeat, daemon=True)
+        heartbeat.start()
+        self._threads.append(heartbeat)
+        logger.info(f"Started {self.workers} task workers for stages {list(self.handlers)}")
+    
+    def stop(self, timeout: float = None):
+        """Stop all threads, letting running tasks finish
+        
+        Args:
+            timeout: Seconds to wait for each thread
+        """
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+    
+    def _work(self, worker_id: str):
+        """Claim and run tasks until stopped"""
+        stages = list(self.handlers)
+        while not self._stop.is_set():
+            try:
+                task = self.queue.claim(worker_id, stages)
+            except Exception as e:
+                logger.error(f"Error claiming task: {e}")
+                task = None
+            
+            if task is None:
+                self._stop.wait(self.poll_interval)
+                continue
+            
+            self._run(task)
+    
+    def _run(self, task: Dict[str, Any]):
+        """Run one claimed task and record the outcome"""
+        with self._running_lock:
+            self._running.add(task["id"])
+        try:
+            logger.info(f"Running '{task['stage']}' task {task['id']} for job {task['job_id']} (attempt {task['attempts']})")
+            next_stage = self.handlers[task["stage"]](task["job_id"], task["payload"])
+            self.queue.complete(task["id"], next_stage)
+        except Exception as e:
+            logger.error(f"Task {task['id']} failed: {e}\n{traceback.format_exc()}")
+            try:
+                final = self.queue.fail(task["id"], str(e))
+                if final and self.on_failed:
+                    self.on_failed(task["job_id"], str(e))
+            except Exception as e2:
+                logger.error(f"Error recording failure of task {task['id']}: {e2}")
+        finally:
+            with self._running_lock:
+                self._running.discard(task["id"])
+    
+    def _heartbeat(self):
+        """Extend the lease of running tasks until stopped"""
+        while not self._stop.wait(config.TASK_HEARTBEAT_SECONDS):
+            with self._running_lock:
+                task_ids = list(self._running)
+            self.queue.heartbeat(task_ids)
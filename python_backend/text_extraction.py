@@ -0,0 +1,68 @@
+import logging
+from functools import partial
+from typing import List
+
+import PyPDF2
+import docx
+
+import config
+from cpu_pool import CPUPool, get_cpu_pool
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def extract_pdf_pages(file_path: str, pages: List[int]) -> List[str]:
+    """Extract the text of some pages of a PDF (runs in a CPU pool worker)
+    
+    Args:
+        file_path: Path to the PDF file
+        pages: Page numbers to extract
+        
+    Returns:
+        Text of each page, in the order given
+    """
+    with open(file_path, 'rb') as f:
+        pdf_reader = PyPDF2.PdfReader(f)
+        return [pdf_reader.pages[page].extract_text() + "\n" for page in pages]
+
+def extract_pdf_text(file_path: str, pool: CPUPool = None) -> str:
+    """Extract text from a PDF file, sharding pages across the CPU pool
+    
+    Args:
+        file_path: Path to the PDF file
+        pool: CPU pool (default: the shared pool)
+        
+    Returns:
+        Extracted text
+    """
+    with open(file_path, 'rb') as f:
+        page_count = len(PyPDF2.PdfReader(f).pages)
+    
+    pool = pool or get_cpu_pool()
+    pages = pool.map_shards(
+        partial(extract_pdf_pages, file_path),
+        range(page_count),
+        shard_size=config.CPU_PDF_PAGES_PER_SHARD
+    )
+    return "".join(pages)
+
+def _read_docx_text(file_path: str) -> str:
+    """Read the paragraphs of a DOCX file (runs in a CPU pool worker)"""
+    doc = docx.Document(file_path)
+    text = ""
+    for para in doc.paragraphs:
+        text += para.text + "\n"
+    return text
+
+def extract_docx_text(file_path: str, pool: CPUPool = None) -> str:
+    """Extract text from a DOCX file in the CPU pool
+    
+    Args:
+        file_path: Path to the DOCX file
+        pool: CPU pool (default: the shared pool)
+        
+    Returns:
+        Extracted text
+    """
+    return (pool or get_cpu_pool()).submit(_read_docx_text, file_path)
@@ -1,9 +1,6 @@
 import os
 import sys
 import logging
-import pandas as pd
-import PyPDF2
-import docx
 from typing import List, Dict, Any, Tuple, Optional
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from sqlalchemy import Column, Integer, String, JSON
@@ -12,8 +9,10 @@ from sqlalchemy import Column, Integer, String, JSON
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import config
-from models import Document, DocumentChunk, Job, JobResult, GeneratedDocument
+from models import Document, DocumentChunk, Job, JobResult, GeneratedDocument, Session
 from vector_db.vector_store import VectorStore
+from text_extraction import extract_pdf_text, extract_docx_text
+from csv_stream import iter_csv_batches
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -22,9 +21,13 @@ logger = logging.getLogger(__name__)
 class DocumentProcessor:
     """Process documents and add them to the vector store"""
     
-    def __init__(self):
-        """Initialize the document processor"""
-        self.vector_store = VectorStore()
+    def __init__(self, vector_store: VectorStore = None):
+        """Initialize the document processor
+        
+        Args:
+            vector_store: Vector store to share (default: create a new one)
+        """
+        self.vector_store = vector_store or VectorStore()
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=config.CHUNK_SIZE,
             chunk_overlap=config.CHUNK_OVERLAP,
@@ -48,15 +51,20 @@ class DocumentProcessor:
                 logger.error(f"Document with ID {document_id} not found")
                 return False
             
-            # Extract text from document
-            text = self._extract_text(document.file_path, document.file_type)
-            if not text:
-                logger.error(f"Failed to extract text from document {document.original_filename}")
-                return False
+            # Extract text from document (student CSVs are streamed from disk instead)
+            text = None
+            if document.document_type != 'student_data':
+                text = self._extract_text(document.file_path, document.file_type)
+                if not text:
+                    logger.error(f"Failed to extract text from document {document.original_filename}")
+                    return False
+            
+            # Drop chunks from an earlier attempt so reprocessing is idempotent
+            self._clear_chunks(document, session)
             
             # Process based on document type
             if document.document_type == 'student_data':
-                return self._process_student_data(document, text, session)
+                return self._process_student_data(document, session)
             elif document.document_type == 'job_description':
                 return self._process_job_description(document, text, session)
             else:
@@ -68,6 +76,21 @@ class DocumentProcessor:
         finally:
             session.close()
     
+    def _clear_chunks(self, document: Document, session):
+        """Remove a document's existing chunks from the database and vector store
+        
+        Args:
+            document: Document object
+            session: Database session
+        """
+        # Vectors are deleted even without chunk rows: a rolled-back attempt
+        # leaves the vectors of the batches it had already added
+        self.vector_store.delete({"document_id": document.id})
+        deleted = session.query(DocumentChunk).filter(DocumentChunk.document_id == document.id).delete(synchronize_session=False)
+        if deleted:
+            session.commit()
+            logger.info(f"Cleared {deleted} existing chunks for document {document.id}")
+    
     def _extract_text(self, file_path: str, file_type: str) -> str:
         """Extract text from a file
         
@@ -86,8 +109,6 @@ class DocumentProcessor:
             elif file_type == 'txt':
                 with open(file_path, 'r', encoding='utf-8') as f:
                     return f.read()
-            elif file_type == 'csv':
-                return self._extract_text_from_csv(file_path)
             else:
                 logger.error(f"Unsupported file type: {file_type}")
                 return ""
@@ -96,82 +117,59 @@ class DocumentProcessor:
             return ""
     
     def _extract_text_from_pdf(self, file_path: str) -> str:
-        """Extract text from a PDF file"""
-        text = ""
-        with open(file_path, 'rb') as f:
-            pdf_reader = PyPDF2.PdfReader(f)
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-        return text
+        """Extract text from a PDF file (pages are sharded across the CPU pool)"""
+        return extract_pdf_text(file_path)
     
     def _extract_text_from_docx(self, file_path: str) -> str:
-        """Extract text from a DOCX file"""
-        doc = docx.Document(file_path)
-        text = ""
-        for para in doc.paragraphs:
-            text += para.text + "\n"
-        return text
+        """Extract text from a DOCX file in the CPU pool"""
+        return extract_docx_text(file_path)
     
-    def _extract_text_from_csv(self, file_path: str) -> str:
-        """Extract text from a CSV file"""
-        df = pd.read_csv(file_path)
-        return df.to_json(orient='records')
-    
-    def _process_student_data(self, document: Document, text: str, session) -> bool:
+    def _process_student_data(self, document: Document, session) -> bool:
         """Process student data CSV
         
+        The file is streamed in row batches, so memory use does not grow
+        with the size of the CSV.
+        
         Args:
             document: Document object
-            text: Extracted text (JSON string)
             session: Database session
             
         Returns:
             True if successful, False otherwise
         """
         try:
-            # Parse CSV data
-            df = pd.read_csv(document.file_path)
-            
-            # Process each row as a separate chunk
-            for index, row in df.iterrows():
-                # Convert row to dictionary
-                student_data = row.to_dict()
-                
-                # Extract email (required for document generation)
-                email = student_data.get('email', student_data.get('Email', ''))
-                if not email:
-                    logger.warning(f"No email found for student at row {index+1}")
+            rows = 0
+            for batch in iter_csv_batches(document.file_path):
+                texts = []
+                metadatas = []
+                for index, student_data in zip(batch.index, batch.to_dict('records')):
+                    # Extract email (required for document generation)
+                    email = student_data.get('email', student_data.get('Email', ''))
+                    if not email:
+                        logger.warning(f"No email found for student at row {index+1}")
+                    
+                    # Create metadata
+                    metadata = {
+                        'document_id': document.id,
+                        'document_type': 'student_data',
+                        'row_index': int(index),
+                        'email': email
+                    }
+                    
+                    # Add student data to metadata
+                    metadata.update(student_data)
+                    
+                    # Convert row to text
+                    texts.append(", ".join([f"{k}: {v}" for k, v in student_data.items() if v]))
+                    metadatas.append(metadata)
                 
-                # Create metadata
-                metadata = {
-                    'document_id': document.id,
-                    'document_type': 'student_data',
-                    'row_index': index,
-                    'email': email
-                }
-                
-                # Add student data to metadata
-                metadata.update(student_data)
-                
-                # Convert row to text
-                row_text = ", ".join([f"{k}: {v}" for k, v in student_data.items() if v])
-                
-                # Create document chunk
-                chunk = DocumentChunk(
-                    document_id=document.id,
-                    chunk_index=index,
-                    text=row_text,
-                    doc_metadata=metadata
-                )
-                session.add(chunk)
-                
-                # Add to vector store
-                vector_ids = self.vector_store.add_documents([row_text], [metadata])
-                if vector_ids:
-                    chunk.vector_id = vector_ids[0]
+                self._ingest_chunks(document, texts, metadatas, session, first_index=rows)
+                rows += len(batch)
             
+            # Persist once per document
+            self.vector_store.persist()
             session.commit()
-            logger.info(f"Processed student data with {len(df)} rows")
+            logger.info(f"Processed student data with {rows} rows")
             return True
         except Exception as e:
             session.rollback()
@@ -199,30 +197,20 @@ class DocumentProcessor:
             # Split text into chunks
             chunks = self.text_splitter.split_text(text)
             
-            # Process each chunk
-            for i, chunk_text in enumerate(chunks):
-                # Create metadata
-                metadata = {
+            # Create metadata for each chunk
+            metadatas = [
+                {
                     'document_id': document.id,
                     'document_type': 'job_description',
                     'chunk_index': i,
                     'company': company,
                     'role': role
                 }
-                
-                # Create document chunk
-                chunk = DocumentChunk(
-                    document_id=document.id,
-                    chunk_index=i,
-                    text=chunk_text,
-                    doc_metadata=metadata
-                )
-                session.add(chunk)
-                
-                # Add to vector store
-                vector_ids = self.vector_store.add_documents([chunk_text], [metadata])
-                if vector_ids:
-                    chunk.vector_id = vector_ids[0]
+                for i in range(len(chunks))
+            ]
+            
+            self._ingest_chunks(document, chunks, metadatas, session)
+            self.vector_store.persist()
             
             session.commit()
             logger.info(f"Processed job description with {len(chunks)} chunks")
@@ -230,4 +218,43 @@ class DocumentProcessor:
         except Exception as e:
             session.rollback()
             logger.error(f"Error processing job description: {e}")
-            return False
\ No newline at end of file
+            return False
+    
+    def _ingest_chunks(
+        self,
+        document: Document,
+        texts: List[str],
+        metadatas: List[Dict[str, Any]],
+        session,
+        first_index: int = 0
+    ):
+        """Embed chunks in batches and bulk insert their DocumentChunk rows
+        
+        Args:
+            document: Document object
+            texts: Chunk texts, in chunk order
+            metadatas: Metadata for each chunk
+            session: Database session (committed by the caller)
+            first_index: Chunk index of the first text
+        """
+        batch_size = config.INGEST_BATCH_SIZE
+        for start in range(0, len(texts), batch_size):
+            batch_texts = texts[start:start + batch_size]
+            batch_metadatas = metadatas[start:start + batch_size]
+            
+            # One embedding call and one Chroma insert per batch
+            vector_ids = self.vector_store.add_documents(batch_texts, batch_metadatas, persist=False)
+            if len(vector_ids) != len(batch_texts):
+                # Fail the document so its transaction rolls back and the ingest task is retried
+                raise RuntimeError(f"Vector store added {len(vector_ids)} of {len(batch_texts)} chunks for document {document.id}")
+            
+            session.bulk_insert_mappings(DocumentChunk, [
+                {
+                    'document_id': document.id,
+                    'chunk_index': first_index + start + offset,
+                    'text': text,
+                    'doc_metadata': metadata,
+                    'vector_id': vector_id
+                }
+                for offset, (text, metadata, vector_id) in enumerate(zip(batch_texts, batch_metadatas, vector_ids))
+            ])
\ No newline at end of file
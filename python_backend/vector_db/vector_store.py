@@ -15,14 +15,33 @@ from langchain.schema import Document as LangchainDocument
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def build_embeddings() -> HuggingFaceEmbeddings:
+    """Load the embeddings model"""
+    return HuggingFaceEmbeddings(
+        model_name="nomic-ai/nomic-embed-text-v1",
+        model_kwargs={"device": "cpu"},
+        encode_kwargs={"normalize_embeddings": True}
+    )
+
+def build_where(filter: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Convert a metadata filter to a Chroma where clause
+    
+    Chroma accepts one field per where clause, so filters on several
+    fields are combined with $and.
+    """
+    if filter and len(filter) > 1:
+        return {"$and": [{key: value} for key, value in filter.items()]}
+    return filter or None
+
 class VectorStore:
     """Vector store for document embeddings using ChromaDB"""
     
-    def __init__(self, collection_name: str = "documents"):
+    def __init__(self, collection_name: str = "documents", embeddings: HuggingFaceEmbeddings = None):
         """Initialize the vector store
         
         Args:
             collection_name: Name of the collection in ChromaDB
+            embeddings: Embeddings model to share (default: load a new one)
         """
         self.collection_name = collection_name
         self.persist_directory = os.path.join(config.VECTOR_DB_PATH, collection_name)
@@ -32,11 +51,7 @@ class VectorStore:
             os.makedirs(self.persist_directory)
         
         # Initialize embeddings model
-        self.embeddings = HuggingFaceEmbeddings(
-            model_name="nomic-ai/nomic-embed-text-v1",
-            model_kwargs={"device": "cpu"},
-            encode_kwargs={"normalize_embeddings": True}
-        )
+        self.embeddings = embeddings or build_embeddings()
         
         # Initialize ChromaDB
         self.db = Chroma(
@@ -47,12 +62,18 @@ class VectorStore:
         
         logger.info(f"Vector store initialized with collection '{collection_name}'")
     
-    def add_documents(self, texts: List[str], metadatas: List[Dict[str, Any]] = None) -> List[str]:
+    def add_documents(
+        self,
+        texts: List[str],
+        metadatas: List[Dict[str, Any]] = None,
+        persist: bool = True
+    ) -> List[str]:
         """Add documents to the vector store
         
         Args:
             texts: List of text chunks to add
             metadatas: List of metadata dictionaries for each text chunk
+            persist: Persist the collection after adding
             
         Returns:
             List of document IDs
@@ -73,13 +94,21 @@ class VectorStore:
         # Add documents to ChromaDB
         try:
             ids = self.db.add_documents(documents)
-            self.db.persist()
+            if persist:
+                self.db.persist()
             logger.info(f"Added {len(ids)} documents to vector store")
             return ids
         except Exception as e:
             logger.error(f"Error adding documents to vector store: {e}")
             return []
     
+    def persist(self):
+        """Persist the collection to disk"""
+        try:
+            self.db.persist()
+        except Exception as e:
+            logger.error(f"Error persisting vector store: {e}")
+    
     def search(self, query: str, k: int = 5, filter: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Search for similar documents
         
@@ -93,7 +122,7 @@ class VectorStore:
         """
         try:
             results = self.db.similarity_search_with_relevance_scores(
-                query, k=k, filter=filter
+                query, k=k, filter=build_where(filter)
             )
             
             # Format results
@@ -111,6 +140,41 @@ class VectorStore:
             logger.error(f"Error searching vector store: {e}")
             return []
     
+    def get(self, where: Dict[str, Any], limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get documents by exact metadata match, without embedding a query
+        
+        Args:
+            where: Metadata filter, e.g. {"document_type": "student_data", "email": email}
+            limit: Maximum number of documents to return
+            
+        Returns:
+            List of dictionaries with document text and metadata
+        """
+        try:
+            results = self.db._collection.get(
+                where=build_where(where),
+                limit=limit,
+                include=["documents", "metadatas"]
+            )
+            return [
+                {"text": text, "metadata": metadata}
+                for text, metadata in zip(results["documents"], results["metadatas"])
+            ]
+        except Exception as e:
+            logger.error(f"Error getting documents from vector store: {e}")
+            return []
+    
+    def delete(self, where: Dict[str, Any]):
+        """Delete documents matching a metadata filter
+        
+        Args:
+            where: Metadata filter, e.g. {"document_id": 1}
+        """
+        try:
+            self.db._collection.delete(where=build_where(where))
+        except Exception as e:
+            logger.error(f"Error deleting documents from vector store: {e}")
+    
     def delete_collection(self):
         """Delete the collection"""
         try:
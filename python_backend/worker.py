@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Run background task workers outside the web server
+
+Start the server with TASK_WORKERS=0 and run this script on one or more
+machines to process the upload task queue.
+"""
+
+import os
+import sys
+import signal
+import argparse
+import threading
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', type=int, default=int(os.getenv('TASK_WORKERS', 0)) or 2, help='Number of worker threads')
+    args = parser.parse_args()
+    
+    # Keep app from starting its own in-process pool on import
+    os.environ['TASK_WORKERS'] = '0'
+    
+    from app import TASK_HANDLERS, mark_job_failed
+    from task_queue.worker import WorkerPool
+    
+    pool = WorkerPool(TASK_HANDLERS, workers=args.workers, on_failed=mark_job_failed)
+    stopped = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopped.set())
+    signal.signal(signal.SIGINT, lambda *_: stopped.set())
+    
+    pool.start()
+    print(f"✅ Processing tasks with {args.workers} workers (Ctrl+C to stop)")
+    stopped.wait()
+    
+    print("Stopping workers after running tasks finish...")
+    pool.stop()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
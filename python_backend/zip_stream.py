@@ -0,0 +1,150 @@
+import os
+import zlib
+import struct
+import bisect
+import hashlib
+import logging
+from functools import lru_cache
+from datetime import datetime
+from typing import Iterator, List, Tuple
+
+import config
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# ZIP record layouts (stored members, UTF-8 names, no ZIP64)
+LOCAL_HEADER = struct.Struct('<IHHHHHIIIHH')
+CENTRAL_HEADER = struct.Struct('<IHHHHHHIIIHHHHHII')
+END_OF_CENTRAL_DIRECTORY = struct.Struct('<IHHHHIIH')
+ZIP_VERSION = 20
+UTF8_FLAG = 0x0800
+ZIP_MAX_SIZE = 0xFFFFFFFF
+ZIP_MAX_MEMBERS = 0xFFFF
+
+@lru_cache(maxsize=config.EXPORT_CRC_CACHE_SIZE)
+def file_crc32(path: str, size: int, mtime_ns: int) -> int:
+    """CRC-32 of a file, cached by path, size and modification time
+    
+    Args:
+        path: Path to the file
+        size: File size (part of the cache key)
+        mtime_ns: Modification time (part of the cache key)
+        
+    Returns:
+        CRC-32 of the file contents
+    """
+    crc = 0
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            crc = zlib.crc32(block, crc)
+    return crc
+
+def _dos_datetime(timestamp: float) -> Tuple[int, int]:
+    """MS-DOS time and date fields of a timestamp"""
+    dt = datetime.fromtimestamp(timestamp)
+    if dt.year < 1980:
+        dt = datetime(1980, 1, 1)
+    dos_time = (dt.hour << 11) | (dt.minute << 5) | (dt.second // 2)
+    dos_date = ((dt.year - 1980) << 9) | (dt.month << 4) | dt.day
+    return dos_time, dos_date
+
+class ZipPlan:
+    """Byte layout of a ZIP archive of files, streamed without building it
+    
+    Members are stored uncompressed, so every header, and therefore the
+    offset of every byte, is known before streaming starts. That gives the
+    archive a Content-Length and lets any byte range be streamed directly,
+    which is what HTTP range requests and resumed downloads need. Only the
+    member CRCs require reading the files; they are cached between exports.
+    """
+    
+    def __init__(self, members: List[Tuple[str, str]]):
+        """Lay out the archive
+        
+        Args:
+            members: (name in the archive, path on disk) of each file
+            
+        Raises:
+            ValueError: If the archive would need ZIP64 (over 4 GiB or 65535 members)
+        """
+        if len(members) > ZIP_MAX_MEMBERS:
+            raise ValueError(f"Too many files for one archive ({len(members)} > {ZIP_MAX_MEMBERS})")
+        
+        # Segments are (offset, length, bytes or file path), in archive order
+        self._segments = []
+        self.size = 0
+        central = []
+        fingerprint = hashlib.sha256()
+        for name, path in members:
+            stat = os.stat(path)
+            crc = file_crc32(path, stat.st_size, stat.st_mtime_ns)
+            dos_time, dos_date = _dos_datetime(stat.st_mtime)
+            encoded_name = name.encode('utf-8')
+            
+            header_offset = self.size
+            self._add(LOCAL_HEADER.pack(
+                0x04034b50, ZIP_VERSION, UTF8_FLAG, 0, dos_time, dos_date,
+                crc, stat.st_size, stat.st_size, len(encoded_name), 0
+            ) + encoded_name)
+            self._add(path, stat.st_size)
+            central.append(CENTRAL_HEADER.pack(
+                0x02014b50, ZIP_VERSION, ZIP_VERSION, UTF8_FLAG, 0, dos_time, dos_date,
+                crc, stat.st_size, stat.st_size, len(encoded_name), 0, 0, 0, 0, 0o644 << 16, header_offset
+            ) + encoded_name)
+            fingerprint.update(f"{name}\0{stat.st_size}\0{stat.st_mtime_ns}\0{crc}\n".encode('utf-8'))
+        
+        central_offset = self.size
+        central_directory = b''.join(central)
+        self._add(central_directory + END_OF_CENTRAL_DIRECTORY.pack(
+            0x06054b50, 0, 0, len(members), len(members), len(central_directory), central_offset, 0
+        ))
+        if self.size > ZIP_MAX_SIZE:
+            raise ValueError(f"Archive too large ({self.size} bytes > {ZIP_MAX_SIZE})")
+        
+        self.etag = fingerprint.hexdigest()
+        self._offsets = [offset for offset, _, _ in self._segments]
+    
+    def _add(self, data, length: int = None):
+        """Append bytes, or a file of the given length, to the layout"""
+        length = len(data) if length is None else length
+        self._segments.append((self.size, length, data))
+        self.size += length
+    
+    def iter_bytes(self, start: int = 0, stop: int = None, chunk_size: int = None) -> Iterator[bytes]:
+        """Stream part of the archive
+        
+        File data is copied through one reused buffer, so memory use does
+        not depend on the number or size of the members.
+        
+        Args:
+            start: First byte
+            stop: Byte after the last one (default: end of the archive)
+            chunk_size: Bytes read from a file at a time (default: from config)
+            
+        Yields:
+            Archive bytes from start to stop
+        """
+        stop = self.size if stop is None else stop
+        buffer = memoryview(bytearray(chunk_size or config.EXPORT_CHUNK_BYTES))
+        index = bisect.bisect_right(self._offsets, start) - 1
+        position = start
+        while position < stop and index < len(self._segments):
+            offset, length, data = self._segments[index]
+            begin = position - offset
+            end = min(length, stop - offset)
+            if isinstance(data, bytes):
+                yield data[begin:end]
+            else:
+                with open(data, 'rb') as f:
+                    f.seek(begin)
+                    remaining = end - begin
+                    while remaining:
+                        read = f.readinto(buffer[:min(remaining, len(buffer))])
+                        if not read:
+                            raise IOError(f"{data} changed while it was being exported")
+                        yield bytes(buffer[:read])
+                        remaining -= read
+            position = offset + end
+            index += 1
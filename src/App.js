@@ -8,7 +8,7 @@ import ProcessingStatus from './components/ProcessingStatus';
 // Removed unused import: ResultsDisplay
 import InterviewPrep from './components/InterviewPrep';
 import GdPrep from './components/GdPrep';
-import { uploadFiles, getProcessingStatus } from './services/api';
+import { uploadFiles, getProcessingStatus, watchJob } from './services/api';
 
 function App() {
   const [csvData, setCsvData] = useState(null);
@@ -40,53 +40,93 @@ function App() {
     };
   }, [analysisResults]);
   
-  // Poll for processing status from the backend
+  // Follow processing status from the backend
+  const jobId = processingData && processingData.status === 'processing' ? processingData.jobId : null;
   useEffect(() => {
     let timer;
     
-    if (processingData && processingData.status === 'processing' && processingData.jobId) {
-      timer = setInterval(async () => {
-        try {
-          // Call the API to get the current status
-          const statusResponse = await getProcessingStatus(processingData.jobId);
-          console.log('Status update:', statusResponse);
+    if (!jobId) return undefined;
+    
+    const applyStatus = (statusResponse) => {
+      console.log('Status update:', statusResponse);
+      
+      // Update the processing data
+      setProcessingData(prev => {
+        if (!prev) return null;
+        
+        // If processing is complete, stop following the job
+        if (statusResponse.status === 'completed') {
+          if (timer) clearInterval(timer);
+          setIsProcessing(false);
           
-          // Update the processing data
-          setProcessingData(prev => {
-            if (!prev) return null;
-            
-            // If processing is complete, clear the interval
-            if (statusResponse.status === 'completed') {
-              clearInterval(timer);
-              setIsProcessing(false);
-              
-              return {
-                ...prev,
-                status: 'completed',
-                processedStudents: statusResponse.processed_students || statusResponse.total_students,
-                totalStudents: statusResponse.total_students,
-                results: statusResponse.results || []
-              };
-            }
-            
-            // Otherwise, update the progress
-            return {
-              ...prev,
-              processedStudents: statusResponse.processed_students || 0,
-              totalStudents: statusResponse.total_students
-            };
-          });
-        } catch (error) {
-          console.error('Error polling for status:', error);
-          // If there's an error, we'll keep trying
+          return {
+            ...prev,
+            status: 'completed',
+            processedStudents: statusResponse.processed_students || statusResponse.total_students,
+            totalStudents: statusResponse.total_students,
+            results: statusResponse.results || []
+          };
         }
-      }, 2000); // Poll every 2 seconds
-    }
+        
+        // If processing failed, stop following the job and keep the students that finished
+        if (statusResponse.status === 'failed') {
+          if (timer) clearInterval(timer);
+          setIsProcessing(false);
+          
+          return {
+            ...prev,
+            status: 'error',
+            error: 'The job failed before all students were processed',
+            processedStudents: statusResponse.processed_students || 0,
+            totalStudents: statusResponse.total_students,
+            results: statusResponse.results || []
+          };
+        }
+        
+        // Otherwise, update the progress
+        return {
+          ...prev,
+          processedStudents: statusResponse.processed_students || 0,
+          totalStudents: statusResponse.total_students
+        };
+      });
+    };
+    
+    const poll = async () => {
+      try {
+        // Call the API to get the current status
+        applyStatus(await getProcessingStatus(jobId));
+      } catch (error) {
+        console.error('Error polling for status:', error);
+        // If there's an error, we'll keep trying
+      }
+    };
+    
+    // Progress is pushed by the server; fall back to polling every 2 seconds
+    const closeStream = watchJob(jobId, {
+      onStatus: (status) => {
+        if (status.status === 'completed' || status.status === 'failed') {
+          // Fetch the results once
+          poll();
+        } else {
+          applyStatus(status);
+        }
+      },
+      onStudent: (student) => applyStatus({
+        status: 'processing',
+        processed_students: student.processed_students,
+        total_students: student.total_students
+      }),
+      onError: () => {
+        timer = setInterval(poll, 2000);
+      }
+    });
     
     return () => {
       if (timer) clearInterval(timer);
+      closeStream();
     };
-  }, [processingData]);
+  }, [jobId]);
   
   const handleCsvUpload = (data) => {
     setCsvData(data);
@@ -31,17 +31,74 @@ export const uploadFiles = async (csvData, jobDescFile) => {
  * Polls the server for processing status updates
  * @param {string} jobId - Processing job ID
  * @returns {Promise} - Promise that resolves to current processing status
+ *   (with all results once the job has completed or failed)
  */
 export const getProcessingStatus = async (jobId) => {
   try {
-    const response = await axios.get(`${API_URL}/job/${jobId}`);
-    return response.data;
+    // Only progress while the job runs; results are fetched once it finishes
+    const response = await axios.get(`${API_URL}/job/${jobId}`, {
+      params: { progress_only: true }
+    });
+    const status = response.data;
+    if (status.status === 'completed' || status.status === 'failed') {
+      status.results = await getJobResults(jobId);
+    }
+    return status;
   } catch (error) {
     console.error('Error getting processing status:', error);
     throw new Error(error.response?.data?.error || 'Failed to get processing status');
   }
 };
 
+/**
+ * Watches a job's progress over server-sent events
+ * @param {string} jobId - Processing job ID
+ * @param {Object} handlers - onStatus(status), onStudent(student) and onError(error) callbacks
+ * @returns {Function} - Function that closes the stream
+ */
+export const watchJob = (jobId, { onStatus, onStudent, onError }) => {
+  const source = new EventSource(`${API_URL}/job/${jobId}/events`);
+  
+  source.addEventListener('status', (event) => {
+    const status = JSON.parse(event.data);
+    if (status.status === 'completed' || status.status === 'failed') {
+      source.close();
+    }
+    onStatus && onStatus(status);
+  });
+  
+  source.addEventListener('student', (event) => {
+    onStudent && onStudent(JSON.parse(event.data));
+  });
+  
+  source.onerror = () => {
+    // The server closes the stream once the job finishes
+    if (source.readyState === EventSource.CLOSED) return;
+    source.close();
+    onError && onError(new Error('Lost connection to job progress stream'));
+  };
+  
+  return () => source.close();
+};
+
+/**
+ * Fetches every result of a job, following the pagination cursor
+ * @param {string} jobId - Processing job ID
+ * @returns {Promise} - Promise that resolves to the list of results
+ */
+export const getJobResults = async (jobId) => {
+  const results = [];
+  let cursor = 0;
+  while (cursor !== null) {
+    const response = await axios.get(`${API_URL}/job/${jobId}`, {
+      params: { cursor, results_only: true }
+    });
+    results.push(...response.data.results);
+    cursor = response.data.next_cursor;
+  }
+  return results;
+};
+
 /**
  * Gets a list of recent jobs
  * @returns {Promise} - Promise that resolves to list of jobs